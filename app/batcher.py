@@ -0,0 +1,72 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from clients import region_var, use_region
+
+BATCH_GET_LIMIT = 100
+
+
+class CrawlerBatcher:
+    """
+    Coalesces concurrent single-crawler lookups arriving within window seconds
+    into one Glue BatchGetCrawlers call, chunked at the API's 100-name limit.
+    Lookups are batched per region.
+    """
+
+    def __init__(self, executor, window: float = 0.005):
+        self.executor = executor
+        self.window = window
+        self._pending: Dict[Optional[str], Dict[str, List[asyncio.Future]]] = {}
+        self._flush_handles = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def fetch(self, names: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """Fetch crawlers by name in parallel chunks, returning (found by name, not found names)."""
+        names = list(dict.fromkeys(names))
+        chunks = [names[i:i + BATCH_GET_LIMIT] for i in range(0, len(names), BATCH_GET_LIMIT)]
+        responses = await asyncio.gather(*(
+            self.executor.call('batch_get_crawlers', CrawlerNames=chunk) for chunk in chunks))
+        found, not_found = {}, []
+        for response in responses:
+            for crawler in response.get('Crawlers', []):
+                found[crawler['Name']] = crawler
+            not_found.extend(response.get('CrawlersNotFound', []))
+        return found, not_found
+
+    async def get(self, name: str) -> Optional[dict]:
+        """Return the crawler definition, or None if Glue reports it as not found."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Batches left by a finished loop (e.g. a test client's) would never be flushed.
+            self._loop, self._pending, self._flush_handles = loop, {}, {}
+        future = loop.create_future()
+        region = region_var.get()
+        pending = self._pending.setdefault(region, {})
+        pending.setdefault(name, []).append(future)
+        if len(pending) >= BATCH_GET_LIMIT:
+            self._flush(region)
+        elif region not in self._flush_handles:
+            self._flush_handles[region] = loop.call_later(self.window, self._flush, region)
+        return await future
+
+    def _flush(self, region: Optional[str]):
+        handle = self._flush_handles.pop(region, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self._pending.pop(region, {})
+        asyncio.ensure_future(self._resolve(region, pending))
+
+    async def _resolve(self, region: Optional[str], pending: Dict[str, List[asyncio.Future]]):
+        use_region(region)
+        try:
+            found, _ = await self.fetch(list(pending))
+        except Exception as error:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+        for name, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(name))
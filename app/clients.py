@@ -0,0 +1,108 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional
+
+region_var: ContextVar[Optional[str]] = ContextVar('glue_region', default=None)
+
+
+def use_region(region: Optional[str]):
+    """Select the Glue region for calls made from the current task; None means the default region."""
+    region_var.set(region)
+
+
+class GlueClients:
+    """
+    Builds one pooled boto3 Glue client per region from a shared session and
+    hands out the one selected by region_var.
+    Static keys (and session token) from .env or the environment are used when
+    given. Otherwise the default credential chain is used (IRSA web identity,
+    instance role, ...), whose credentials botocore refreshes on its own, so
+    rotation needs no restart.
+    endpoint_url points every client at a Glue stand-in, e.g. the benchmark fake.
+    boto3, the session and the clients are only loaded on first use (or by
+    warm_up), so importing the app needs neither botocore's data files nor
+    credentials.
+    """
+
+    def __init__(self, access_key_id: Optional[str] = None, secret_access_key: Optional[str] = None,
+                 session_token: Optional[str] = None,
+                 default_region: Optional[str] = None, regions: Optional[Iterable[str]] = None,
+                 max_pool_connections: int = 10, connect_timeout: float = 5, read_timeout: float = 60,
+                 tcp_keepalive: bool = True, endpoint_url: Optional[str] = None):
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.session_token = session_token
+        self.endpoint_url = endpoint_url
+        self.max_pool_connections = max_pool_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.tcp_keepalive = tcp_keepalive
+        self.build_seconds: Dict[Optional[str], float] = {}
+        self._default_region = default_region
+        self._regions = set(regions) if regions else None
+        self._session = None
+        self._config = None
+        self._clients: Dict[Optional[str], object] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import boto3
+                    from botocore.config import Config
+                    self._config = Config(max_pool_connections=self.max_pool_connections,
+                                          connect_timeout=self.connect_timeout,
+                                          read_timeout=self.read_timeout,
+                                          tcp_keepalive=self.tcp_keepalive,
+                                          retries={'total_max_attempts': 1})
+                    self._session = boto3.session.Session(aws_access_key_id=self.access_key_id,
+                                                          aws_secret_access_key=self.secret_access_key,
+                                                          aws_session_token=self.session_token,
+                                                          region_name=self._default_region)
+        return self._session
+
+    @property
+    def default_region(self) -> Optional[str]:
+        """aws_region, else the region the environment or AWS config resolves to."""
+        return self._default_region or self.session.region_name
+
+    @property
+    def regions(self) -> set:
+        """The allowed regions: glue_regions, else every region botocore knows Glue in."""
+        if self._regions is None:
+            with self._lock:
+                if self._regions is None:
+                    self._regions = set(self.session.get_available_regions('glue'))
+        return self._regions
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the session and the region allow-list are built, so default_region and is_allowed don't block."""
+        return self._session is not None and self._regions is not None
+
+    def client(self, region: Optional[str] = None):
+        """Return the Glue client for region, or for the region selected by region_var."""
+        region = region or region_var.get() or self._default_region
+        client = self._clients.get(region)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(region)
+                if client is None:
+                    start = time.perf_counter()
+                    session = self.session
+                    client = session.client('glue', region_name=region, endpoint_url=self.endpoint_url,
+                                            config=self._config)
+                    self.build_seconds[region] = time.perf_counter() - start
+                    self._clients[region] = client
+        return client
+
+    def warm_up(self):
+        """Load boto3, build the region allow-list and the default region's client ahead of the first request."""
+        self.regions  # builds the session and the allow-list
+        self.client()
+
+    def is_allowed(self, region: str) -> bool:
+        return region == self.default_region or region in self.regions
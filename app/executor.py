@@ -0,0 +1,132 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+from botocore.exceptions import ClientError
+from clients import region_var
+from ratelimit import THROTTLING_CODES, RateLimiter, RetryPolicy
+
+
+class GlueExecutor:
+    """
+    Runs blocking boto3 Glue client calls on a bounded thread pool so a slow
+    Glue round-trip never stalls the event loop.
+    Calls are paced per operation by the rate limiter and retried with
+    backoff on throttling and timeouts.
+    The client for the region selected by clients.region_var is used, so a
+    botocore Stubber can be activated on clients.client() in tests.
+    """
+
+    def __init__(self, clients, max_concurrency: int = 32,
+                 limiter: Optional[RateLimiter] = None, retry: Optional[RetryPolicy] = None,
+                 observe: Optional[Callable[[str, str, float], None]] = None):
+        self.clients = clients
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.observe = observe
+        self.in_flight = 0
+        self._running: Set[Future] = set()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency,
+                                        thread_name_prefix="glue")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker thread."""
+        return max(self.in_flight - self.max_concurrency, 0)
+
+    async def call(self, operation: str, **kwargs):
+        """Invoke a Glue client operation by name without blocking the loop."""
+        bucket = self.limiter.bucket(operation)
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            try:
+                response = await self._run(operation, kwargs)
+            except ClientError as error:
+                code = error.response['Error']['Code']
+                if code in THROTTLING_CODES:
+                    bucket.on_throttle()
+                if not self.retry.should_retry(code, attempt):
+                    raise
+                await asyncio.sleep(self.retry.backoff(attempt))
+                attempt += 1
+                continue
+            bucket.on_success()
+            self.retry.on_success()
+            return response
+
+    async def _run(self, operation: str, kwargs: dict):
+        self.in_flight += 1
+        try:
+            future = self._pool.submit(self._invoke, operation, region_var.get(), kwargs)
+            self._running.add(future)
+            future.add_done_callback(self._running.discard)
+            return await asyncio.wrap_future(future)
+        finally:
+            self.in_flight -= 1
+
+    def _invoke(self, operation: str, region: Optional[str], kwargs: dict):
+        """
+        Runs on a worker thread, so building a region's client on first use never
+        blocks the loop; reports the latency of each attempt to observe.
+        """
+        method = getattr(self.clients.client(region), operation)
+        start = time.perf_counter()
+        code = 'OK'
+        try:
+            return method(**kwargs)
+        except ClientError as error:
+            code = error.response['Error']['Code']
+            raise
+        except Exception:
+            code = 'Exception'
+            raise
+        finally:
+            if self.observe is not None:
+                self.observe(operation, code, time.perf_counter() - start)
+
+    async def paginate(self, operation: str, result_key: str, limit: Optional[int] = None,
+                       next_token: Optional[str] = None, page_size: int = 1000, **kwargs):
+        """
+        Walk a NextToken-paginated operation, yielding (items, next_token) per page.
+        Stops once limit items were returned; the last next_token resumes from there.
+        """
+        remaining = limit
+        while True:
+            params = dict(kwargs, MaxResults=page_size if remaining is None else min(page_size, remaining))
+            if next_token:
+                params['NextToken'] = next_token
+            response = await self.call(operation, **params)
+            items = response.get(result_key, [])
+            next_token = response.get('NextToken')
+            if remaining is not None:
+                remaining -= len(items)
+            yield items, next_token
+            if not next_token or (remaining is not None and remaining <= 0):
+                return
+
+    async def warm_up(self, connections: int = 0):
+        """
+        Build the default region's client on a worker thread, then open up to
+        connections pooled connections to Glue with concurrent one-item
+        GetCrawlers calls, so early requests skip client construction and the
+        TLS handshake.
+        """
+        await asyncio.wrap_future(self._pool.submit(self.clients.warm_up))
+        await asyncio.gather(*(self.call('get_crawlers', MaxResults=1)
+                               for _ in range(min(connections, self.max_concurrency))))
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Wait up to timeout seconds for the Glue calls already submitted to the pool,
+        including those whose caller was cancelled. Returns whether all finished.
+        """
+        running = [asyncio.wrap_future(future) for future in list(self._running)]
+        if running:
+            await asyncio.wait(running, timeout=timeout)
+        return not self._running
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,33 @@
+import multiprocessing
+import os
+
+from dotenv import dotenv_values
+
+dotenv_config = dotenv_values(".env")
+
+
+def setting(name, default=None):
+    """A setting from the environment (upper-case name) or else .env, as main reads them."""
+    return os.getenv(name.upper()) or dotenv_config.get(name, default)
+
+
+# Each worker is a separate process with its own executor, caches and pollers.
+# More than one worker needs shared_backend_url, so they share one start queue,
+# crawler cache, Glue rate limit and idempotency store; without it a single
+# worker is the default. The same holds for more than one replica, which can't
+# be checked from here: point every replica at the same shared_backend_url.
+workers = int(setting("web_concurrency")
+              or (multiprocessing.cpu_count() if setting("shared_backend_url") else 1))
+if workers > 1 and not setting("shared_backend_url"):
+    raise RuntimeError(f"{workers} workers need shared_backend_url; set it or run WEB_CONCURRENCY=1")
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = setting("bind", "0.0.0.0:8000")
+keepalive = int(setting("keepalive_seconds", 5))
+# Workers finish open requests and drain in-flight Glue calls (shutdown_drain_seconds)
+# within graceful_timeout of SIGTERM; keep terminationGracePeriodSeconds above it.
+graceful_timeout = int(setting("graceful_timeout_seconds", 30))
+timeout = int(setting("worker_timeout_seconds", 120))
+# Not preloaded: the Glue thread pool and clients must be created after the fork.
+preload_app = False
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import math
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from cache import TTLCache
+from clients import region_var
+
+CRAWLER_METRICS_LIMIT = 100
+FINISHED_STATES = ('COMPLETED', 'FAILED', 'STOPPED')
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+TABLE_COUNTS = ('TablesCreated', 'TablesUpdated', 'TablesDeleted')
+RANKINGS = {
+    'MedianRuntimeSeconds': lambda metrics: metrics.get('MedianRuntimeSeconds') or 0,
+    'LastRuntimeSeconds': lambda metrics: metrics.get('LastRuntimeSeconds') or 0,
+    'TablesChanged': lambda metrics: sum(metrics.get(count) or 0 for count in TABLE_COUNTS),
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list, None when it is empty."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def runtime_seconds(crawl: dict) -> Optional[float]:
+    if crawl.get('StartTime') is None or crawl.get('EndTime') is None:
+        return None
+    return (crawl['EndTime'] - crawl['StartTime']).total_seconds()
+
+
+def tables_changed(crawl: dict) -> int:
+    """Tables added, updated or deleted by a crawl, from the JSON Summary ListCrawls returns."""
+    try:
+        tables = json.loads(crawl.get('Summary') or '{}').get('TABLE', {})
+        return sum(int(tables.get(action, {}).get('Count', 0)) for action in ('ADD', 'UPDATE', 'DELETE'))
+    except (ValueError, AttributeError, TypeError):
+        return 0
+
+
+def summarize(crawls: List[dict]) -> dict:
+    """Run count, outcome counts, failure rate, runtime percentiles, DPU hours and tables changed per run."""
+    states = {state: 0 for state in FINISHED_STATES + ('RUNNING',)}
+    for crawl in crawls:
+        states[crawl.get('State')] = states.get(crawl.get('State'), 0) + 1
+    finished = sum(states[state] for state in FINISHED_STATES)
+    runtimes = sorted(seconds for seconds in map(runtime_seconds, crawls) if seconds is not None)
+    changes = [tables_changed(crawl) for crawl in crawls if crawl.get('State') == 'COMPLETED']
+    return {
+        'Runs': len(crawls),
+        'Completed': states['COMPLETED'],
+        'Failed': states['FAILED'],
+        'Stopped': states['STOPPED'],
+        'Running': states['RUNNING'],
+        'FailureRate': states['FAILED'] / finished if finished else None,
+        'MedianRuntimeSeconds': percentile(runtimes, 0.5),
+        'P95RuntimeSeconds': percentile(runtimes, 0.95),
+        'TotalRuntimeSeconds': sum(runtimes),
+        'DPUHours': round(sum(crawl.get('DPUHour') or 0 for crawl in crawls), 4),
+        'TablesChangedPerRun': sum(changes) / len(changes) if changes else None,
+    }
+
+
+def summarize_metrics(records: List[dict]) -> dict:
+    """Fleet-wide view of GetCrawlerMetrics records: runtime percentiles across crawlers and table counts."""
+    runtimes = sorted(record.get('MedianRuntimeSeconds') or 0 for record in records)
+    summary = {
+        'Crawlers': len(records),
+        'MedianRuntimeSeconds': percentile(runtimes, 0.5),
+        'P95RuntimeSeconds': percentile(runtimes, 0.95),
+        'TotalMedianRuntimeSeconds': sum(runtimes),
+    }
+    for count in TABLE_COUNTS:
+        summary[count] = sum(record.get(count) or 0 for record in records)
+    return summary
+
+
+class CrawlerHistory:
+    """
+    Fetches crawler run history (ListCrawls) and Glue's own runtime metrics
+    (GetCrawlerMetrics) through the executor, caching both per crawler and
+    region so fleet-wide stats and single-crawler history share the work.
+    Fleet-wide stats rank on the metrics and walk the history of the top
+    crawlers only.
+    """
+
+    def __init__(self, executor, cache: TTLCache, concurrency: int = 16):
+        self.executor = executor
+        self.cache = cache
+        self.concurrency = concurrency
+
+    async def crawls(self, crawler_name: str, since: Optional[datetime] = None, fresh: bool = False) -> List[dict]:
+        """Every run Glue still keeps for the crawler, newest first, optionally only those started since."""
+        cache_key = ('list_crawls', region_var.get(), crawler_name)
+        crawls = None if fresh else self.cache.get(cache_key)
+        if crawls is None:
+            crawls = []
+            async for items, _ in self.executor.paginate('list_crawls', 'Crawls', CrawlerName=crawler_name):
+                crawls.extend(items)
+            crawls.sort(key=lambda crawl: crawl.get('StartTime') or EPOCH, reverse=True)
+            self.cache.set(cache_key, crawls)
+        if since is not None:
+            crawls = [crawl for crawl in crawls if crawl.get('StartTime') and crawl['StartTime'] >= since]
+        return crawls
+
+    async def metrics(self, crawler_names: List[str], fresh: bool = False) -> Dict[str, dict]:
+        """GetCrawlerMetrics records by crawler name, fetching uncached names in parallel chunks of 100."""
+        region = region_var.get()
+        found, missing = {}, []
+        for name in dict.fromkeys(crawler_names):
+            record = None if fresh else self.cache.get(('get_crawler_metrics', region, name))
+            if record is None:
+                missing.append(name)
+            else:
+                found[name] = record
+
+        async def fetch(chunk: List[str]) -> List[dict]:
+            records = []
+            async for items, _ in self.executor.paginate('get_crawler_metrics', 'CrawlerMetricsList',
+                                                         page_size=CRAWLER_METRICS_LIMIT, CrawlerNameList=chunk):
+                records.extend(items)
+            return records
+
+        chunks = [missing[i:i + CRAWLER_METRICS_LIMIT] for i in range(0, len(missing), CRAWLER_METRICS_LIMIT)]
+        for records in await asyncio.gather(*(fetch(chunk) for chunk in chunks)):
+            for record in records:
+                self.cache.set(('get_crawler_metrics', region, record['CrawlerName']), record)
+                found[record['CrawlerName']] = record
+        return found
+
+    async def fleet(self, crawler_names: List[str], rank_by: str = 'MedianRuntimeSeconds', top: int = 50,
+                    since: Optional[datetime] = None, fresh: bool = False) -> dict:
+        """
+        Ranks the crawlers by a RANKINGS key over their GetCrawlerMetrics, descending, and fetches the
+        run history of the top ones only, so a cold call costs one GetCrawlerMetrics per 100 crawlers
+        plus top ListCrawls walks. Crawlers deleted in the meantime are left out.
+        """
+        metrics = await self.metrics(crawler_names, fresh=fresh)
+        ranked = sorted(metrics.values(), key=RANKINGS[rank_by], reverse=True)[:top]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def crawls(name: str) -> Optional[List[dict]]:
+            async with semaphore:
+                try:
+                    return await self.crawls(name, since=since, fresh=fresh)
+                except ClientError as error:
+                    if error.response['Error']['Code'] != 'EntityNotFoundException':
+                        raise
+                    return None
+
+        runs = await asyncio.gather(*(crawls(record['CrawlerName']) for record in ranked))
+        crawlers = [dict(summarize(crawler_runs), CrawlerName=record['CrawlerName'], Metrics=record)
+                    for record, crawler_runs in zip(ranked, runs) if crawler_runs is not None]
+        return {'Summary': summarize_metrics(list(metrics.values())),
+                'TopSummary': summarize([crawl for crawler_runs in runs if crawler_runs for crawl in crawler_runs]),
+                'CrawlerCount': len(metrics), 'Crawlers': crawlers}
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+from typing import Dict, Optional
+
+import orjson
+from cache import TTLCache
+from metrics import IDEMPOTENT_REQUESTS
+from ratelimit import RETRYABLE_CODES
+
+IDEMPOTENT_METHODS = {'POST', 'PUT'}
+IDEMPOTENT_PATHS = ('/crawler/start_crawler/', '/crawler/stop_crawler/')
+MAX_KEY_LENGTH = 255
+
+
+class MemoryStore:
+    """
+    Bounded in-process idempotency record store. Other backends only need the
+    same async get/set of JSON-compatible dicts.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, record: dict):
+        self.cache.set(key, record)
+
+
+def is_definitive(body: bytes) -> bool:
+    """
+    Whether a response is safe to replay: a success, or a Glue error that a retry
+    cannot change (e.g. AlreadyExistsException). Throttling, timeouts and
+    unhandled exceptions are left for the client to retry.
+    """
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return False
+    if not isinstance(payload, dict):
+        return False
+    if payload.get('success'):
+        return True
+    message = payload.get('message')
+    code = message.get('Code') if isinstance(message, dict) else None
+    return code is not None and code not in RETRYABLE_CODES
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honouring an Idempotency-Key header on POST/PUT routes and
+    on start_crawler/stop_crawler. Concurrent requests with the same key share
+    one execution; later repeats within the store's TTL replay the stored
+    response with an Idempotent-Replayed header. Reusing a key for a different
+    request is answered with 422.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or MemoryStore()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        key = self.idempotency_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            await self.respond(send, 400, {'Code': 'InvalidIdempotencyKey',
+                                           'Message': f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters'})
+            return
+
+        body, receive = await self.buffer_body(receive)
+        fingerprint = self.fingerprint(scope, body)
+        if key in self._in_flight:
+            IDEMPOTENT_REQUESTS.labels('collapsed').inc()
+            record = await asyncio.shield(self._in_flight[key])
+        else:
+            future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                record = await self.store.get(key)
+            except Exception:
+                del self._in_flight[key]
+                future.cancel()
+                raise
+            if record is not None:
+                IDEMPOTENT_REQUESTS.labels('replayed').inc()
+                del self._in_flight[key]
+                future.set_result(record)
+        if record is not None:
+            if record['fingerprint'] != fingerprint:
+                IDEMPOTENT_REQUESTS.labels('conflict').inc()
+                await self.respond(send, 422, {'Code': 'IdempotencyKeyReused',
+                                               'Message': 'Idempotency-Key was already used for a different request'})
+                return
+            await self.replay(send, record)
+            return
+
+        record = {'fingerprint': fingerprint, 'status': 500, 'headers': [], 'body': ''}
+        chunks = []
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                record['status'] = message['status']
+                record['headers'] = [[name.decode('latin-1'), value.decode('latin-1')]
+                                     for name, value in message.get('headers', [])]
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+            await send(message)
+
+        IDEMPOTENT_REQUESTS.labels('executed').inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+            response_body = b''.join(chunks)
+            record['body'] = response_body.decode()
+            if record['status'] < 500 and is_definitive(response_body):
+                await self.store.set(key, record)
+        finally:
+            del self._in_flight[key]
+            future.set_result(record)
+
+    @staticmethod
+    def idempotency_key(scope) -> Optional[str]:
+        if scope['type'] != 'http':
+            return None
+        if scope['method'] not in IDEMPOTENT_METHODS and not scope['path'].startswith(IDEMPOTENT_PATHS):
+            return None
+        for name, value in scope['headers']:
+            if name == b'idempotency-key':
+                return value.decode('latin-1')
+        return None
+
+    @staticmethod
+    def fingerprint(scope, body: bytes) -> str:
+        """Hash of everything that selects the Glue call: method, path, query, region header and body."""
+        region = next((value for name, value in scope['headers'] if name == b'x-glue-region'), b'')
+        digest = hashlib.sha256()
+        for part in (scope['method'].encode(), scope['path'].encode(), scope['query_string'], region, body):
+            digest.update(part + b'\0')
+        return digest.hexdigest()
+
+    @staticmethod
+    async def buffer_body(receive):
+        """Read the whole request body and return it with a receive callable that yields it again."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] != 'http.request':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body = b''.join(chunks)
+        sent = False
+
+        async def replay_receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return await receive()
+
+        return body, replay_receive
+
+    @staticmethod
+    async def replay(send, record: dict):
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in record['headers']]
+        await send({'type': 'http.response.start', 'status': record['status'],
+                    'headers': headers + [(b'idempotent-replayed', b'true')]})
+        await send({'type': 'http.response.body', 'body': record['body'].encode()})
+
+    @staticmethod
+    async def respond(send, status: int, message: dict):
+        body = orjson.dumps({'success': False, 'status': status, 'message': message})
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from clients import use_region
+
+PREFIX_END = '\uffff'
+
+
+def crawler_keys(crawler: dict) -> Tuple[Set[str], Set[str], Set[str]]:
+    """Databases, connection names and target paths referenced by a crawler definition."""
+    databases, connections, paths = set(), set(), set()
+    if crawler.get('DatabaseName'):
+        databases.add(crawler['DatabaseName'])
+    targets = crawler.get('Targets') or {}
+    for target_type, items in targets.items():
+        for target in items or []:
+            if target.get('ConnectionName'):
+                connections.add(target['ConnectionName'])
+            if target.get('DatabaseName'):
+                databases.add(target['DatabaseName'])
+            if target.get('Path'):
+                paths.add(target['Path'])
+            paths.update(target.get('DeltaTables') or [])
+    return databases, connections, paths
+
+
+class CrawlerIndex:
+    """
+    In-memory index of crawler definitions in the default region, answering
+    name/path prefix and database/connection/state/last-run filters without
+    calling Glue. A background task re-walks the paginated get_crawlers
+    listing every refresh_interval seconds and applies only the changes.
+    """
+
+    def __init__(self, executor, refresh_interval: float = 300.0):
+        self.executor = executor
+        self.refresh_interval = refresh_interval
+        self.crawlers: Dict[str, dict] = {}
+        self.refreshed_at: Optional[float] = None
+        self.refresh_seconds: Optional[float] = None
+        self._by_database: Dict[str, Set[str]] = defaultdict(set)
+        self._by_connection: Dict[str, Set[str]] = defaultdict(set)
+        self._by_state: Dict[str, Set[str]] = defaultdict(set)
+        self._by_last_status: Dict[str, Set[str]] = defaultdict(set)
+        self._names: List[str] = []
+        self._paths: List[Tuple[str, str]] = []
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def upsert(self, crawler: dict):
+        name = crawler['Name']
+        if self.crawlers.get(name) == crawler:
+            return
+        self.remove(name)
+        self.crawlers[name] = crawler
+        insort(self._names, name)
+        databases, connections, paths = crawler_keys(crawler)
+        for database in databases:
+            self._by_database[database].add(name)
+        for connection in connections:
+            self._by_connection[connection].add(name)
+        for path in paths:
+            insort(self._paths, (path, name))
+        self._by_state[crawler.get('State')].add(name)
+        self._by_last_status[(crawler.get('LastCrawl') or {}).get('Status')].add(name)
+
+    def remove(self, name: str):
+        crawler = self.crawlers.pop(name, None)
+        if crawler is None:
+            return
+        del self._names[bisect_left(self._names, name)]
+        databases, connections, paths = crawler_keys(crawler)
+        for database in databases:
+            self._discard(self._by_database, database, name)
+        for connection in connections:
+            self._discard(self._by_connection, connection, name)
+        for path in paths:
+            del self._paths[bisect_left(self._paths, (path, name))]
+        self._discard(self._by_state, crawler.get('State'), name)
+        self._discard(self._by_last_status, (crawler.get('LastCrawl') or {}).get('Status'), name)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key, name: str):
+        names = index.get(key)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del index[key]
+
+    def search(self, name_prefix: Optional[str] = None, path_prefix: Optional[str] = None,
+               database: Optional[str] = None, connection: Optional[str] = None,
+               state: Optional[str] = None, last_status: Optional[str] = None) -> List[dict]:
+        """Crawlers matching every given filter, ordered by name."""
+        candidates = []
+        if name_prefix:
+            low, high = bisect_left(self._names, name_prefix), bisect_left(self._names, name_prefix + PREFIX_END)
+            candidates.append(set(self._names[low:high]))
+        if path_prefix:
+            low, high = bisect_left(self._paths, (path_prefix,)), bisect_left(self._paths, (path_prefix + PREFIX_END,))
+            candidates.append({name for _, name in self._paths[low:high]})
+        for index, key in ((self._by_database, database), (self._by_connection, connection),
+                           (self._by_state, state), (self._by_last_status, last_status)):
+            if key is not None:
+                candidates.append(index.get(key, set()))
+        if not candidates:
+            return [self.crawlers[name] for name in self._names]
+        candidates.sort(key=len)
+        names = set(candidates[0]).intersection(*candidates[1:])
+        return [self.crawlers[name] for name in sorted(names)]
+
+    async def refresh(self):
+        """Walk the full crawler listing, upserting changed crawlers and dropping deleted ones."""
+        start = time.perf_counter()
+        seen = set()
+        async for crawlers, _ in self.executor.paginate('get_crawlers', 'Crawlers'):
+            for crawler in crawlers:
+                seen.add(crawler['Name'])
+                self.upsert(crawler)
+        for name in [name for name in self.crawlers if name not in seen]:
+            self.remove(name)
+        self.refreshed_at = time.time()
+        self.refresh_seconds = time.perf_counter() - start
+
+    async def wait_ready(self, timeout: float) -> bool:
+        if self._ready is None:
+            return False
+        try:
+            await asyncio.wait_for(asyncio.shield(self._ready.wait()), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._ready.is_set()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self):
+        use_region(None)
+        while True:
+            try:
+                await self.refresh()
+                self._ready.set()
+            except Exception:
+                pass
+            await asyncio.sleep(self.refresh_interval)
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self.crawlers),
+            'paths': len(self._paths),
+            'refreshed_at': self.refreshed_at,
+            'refresh_seconds': self.refresh_seconds,
+        }
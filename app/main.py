@@ -1,38 +1,365 @@
-import boto3
+import asyncio
+import os
+import signal
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
 import botocore
+import orjson
+from batcher import CrawlerBatcher
+from cache import TTLCache
+from clients import GlueClients, region_var, use_region
 from dotenv import dotenv_values
-from fastapi import FastAPI
-from model import (CatalogTargets, DeltaTargets, ErrorResponse,
-                   ExceptionResponse, JdbcTargets, S3Targets, SuccessResponse)
+from executor import GlueExecutor
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from history import CrawlerHistory, summarize
+from idempotency import IdempotencyMiddleware, MemoryStore
+from inventory import CrawlerIndex
+from metrics import MetricsMiddleware, observe_glue_call, register_collector
+from model import (BatchCreateCrawlers, BatchGetCrawlers, BatchItemResponse,
+                   BulkCrawlerSelection, CatalogTargets, CrawlerNamesResponse,
+                   CrawlerResponse, CrawlersResponse, DeltaTargets,
+                   ErrorResponse, ExceptionResponse, JdbcTargets, MixedTargets,
+                   S3Targets, SuccessResponse, SyncCrawlers)
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from ratelimit import RateLimiter, RetryPolicy
+from runs import RunTracker
+from scheduler import StartQueue
+from shared import (SharedStartQueue, SharedStore, SharedTokenBucket,
+                    TieredCache, connect)
+from startup import StartupTimes
+from sync import plan_sync
 
+startup_times = StartupTimes()
 config = dotenv_values(".env")
-ACCESS_ID = config.get("aws_access_key_id")
-ACCESS_KEY = config.get("aws_secret_access_key")
-REGION = config.get("aws_region")
 
 
-client = boto3.client('glue', aws_access_key_id=ACCESS_ID,
-                      aws_secret_access_key=ACCESS_KEY, region_name=REGION)
+def setting(name: str, default=None):
+    """
+    A setting from the environment under its upper-case name (AWS_REGION for aws_region), else from .env,
+    so a deployment can configure the image without rebuilding it. Only the names read here are looked up.
+    """
+    value = os.getenv(name.upper())
+    return value if value is not None else config.get(name, default)
+
+
+ACCESS_ID = setting("aws_access_key_id")
+ACCESS_KEY = setting("aws_secret_access_key")
+SESSION_TOKEN = setting("aws_session_token")
+REGION = setting("aws_region")
+MAX_CONCURRENCY = int(setting("glue_max_concurrency", 32))
+MAX_POOL_CONNECTIONS = int(setting("glue_max_pool_connections", MAX_CONCURRENCY))
+CONNECT_TIMEOUT = float(setting("glue_connect_timeout_seconds", 5))
+READ_TIMEOUT = float(setting("glue_read_timeout_seconds", 60))
+TCP_KEEPALIVE = setting("glue_tcp_keepalive", "true").lower() == "true"
+ENDPOINT_URL = setting("glue_endpoint_url")
+WARM_UP = setting("glue_warm_up", "true").lower() == "true"
+WARM_UP_CONNECTIONS = int(setting("glue_warm_up_connections", 0))
+REGIONS = [region.strip() for region in setting("glue_regions", "").split(",") if region.strip()]
+RATE_LIMIT = float(setting("glue_rate_limit", 10))
+# Per-operation limits (glue_rate_limit_<operation>) are only read from .env.
+RATE_LIMITS = {key[len("glue_rate_limit_"):]: float(value) for key, value in config.items()
+               if key.startswith("glue_rate_limit_")}
+MAX_ATTEMPTS = int(setting("glue_max_attempts", 5))
+BATCH_CONCURRENCY = int(setting("batch_concurrency", 16))
+COALESCE_WINDOW = float(setting("get_crawler_coalesce_window_ms", 5)) / 1000
+RUNS_POLL_MIN = float(setting("runs_poll_min_seconds", 5))
+RUNS_POLL_MAX = float(setting("runs_poll_max_seconds", 30))
+MAX_RUNNING_CRAWLERS = int(setting("max_running_crawlers", 25))
+MAX_WAIT_SECONDS = 3600
+SSE_KEEPALIVE_SECONDS = 15
+INVENTORY_REFRESH = float(setting("inventory_refresh_seconds", 300))
+IDEMPOTENCY_MAXSIZE = int(setting("idempotency_maxsize", 10000))
+IDEMPOTENCY_TTL = float(setting("idempotency_ttl_seconds", 3600))
+HISTORY_CACHE_MAXSIZE = int(setting("history_cache_maxsize", 4096))
+HISTORY_CACHE_TTL = float(setting("history_cache_ttl_seconds", 300))
+SHARED_BACKEND_URL = setting("shared_backend_url")
+WORKERS = int(setting("web_concurrency", 1))
+SHUTDOWN_DRAIN_SECONDS = float(setting("shutdown_drain_seconds", 20))
+CACHE_MAXSIZE = int(setting("crawler_cache_maxsize", 1024))
+CACHE_TTL = float(setting("crawler_cache_ttl_seconds", 30))
+
+
+# Replicas can't be counted from inside a pod; running more than one also needs shared_backend_url.
+if WORKERS > 1 and not SHARED_BACKEND_URL:
+    raise RuntimeError(f"{WORKERS} workers need shared_backend_url to share the start queue, "
+                       "Glue rate limits and idempotency records")
+
+clients = GlueClients(access_key_id=ACCESS_ID, secret_access_key=ACCESS_KEY, session_token=SESSION_TOKEN,
+                      default_region=REGION, regions=REGIONS,
+                      max_pool_connections=MAX_POOL_CONNECTIONS,
+                      connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                      tcp_keepalive=TCP_KEEPALIVE, endpoint_url=ENDPOINT_URL)
+shared_backend = connect(SHARED_BACKEND_URL)
+
+
+def shared_bucket(operation: str, rate: float) -> SharedTokenBucket:
+    return SharedTokenBucket(shared_backend, f'glue-rate-limit:{operation}', rate)
+
+
+executor = GlueExecutor(clients, max_concurrency=MAX_CONCURRENCY,
+                        limiter=RateLimiter(default_rate=RATE_LIMIT, rates=RATE_LIMITS,
+                                            bucket_factory=shared_bucket if shared_backend else None),
+                        retry=RetryPolicy(max_attempts=MAX_ATTEMPTS),
+                        observe=observe_glue_call)
+batcher = CrawlerBatcher(executor, window=COALESCE_WINDOW)
+LISTINGS = ('get_crawlers', 'list_crawlers')
+crawler_cache = TieredCache(TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL), shared_backend, indexed=LISTINGS)
+history = CrawlerHistory(executor, TTLCache(maxsize=HISTORY_CACHE_MAXSIZE, ttl=HISTORY_CACHE_TTL),
+                         concurrency=BATCH_CONCURRENCY)
+inventory = CrawlerIndex(executor, refresh_interval=INVENTORY_REFRESH)
+
+
+def tracked_crawler(crawler: dict, region: Optional[str]):
+    """Feed crawler definitions polled by the run tracker into the cache and, for the default region, the inventory."""
+    crawler_cache.set(('get_crawler', region, crawler['Name']), crawler)
+    if region is None:
+        inventory.upsert(crawler)
+
+
+run_tracker = RunTracker(batcher.fetch, min_interval=RUNS_POLL_MIN, max_interval=RUNS_POLL_MAX,
+                         on_crawler=tracked_crawler)
+if shared_backend is not None:
+    start_queue = SharedStartQueue(shared_backend, lambda crawler_name: start_crawler_by_name(crawler_name),
+                                   run_tracker, max_running=MAX_RUNNING_CRAWLERS)
+else:
+    start_queue = StartQueue(lambda crawler_name: start_crawler_by_name(crawler_name), run_tracker,
+                             max_running=MAX_RUNNING_CRAWLERS)
+
+
+async def select_region(region: Optional[str] = Query(None, description="Glue region, defaults to aws_region"),
+                        x_glue_region: Optional[str] = Header(None)):
+    """
+    Route the request's Glue calls to the region given by ?region= or the X-Glue-Region header.
+    Checking a region needs the boto3 session and botocore's endpoint data, which are loaded on a
+    thread if the Glue warm-up has not done so yet.
+    """
+    region = region or x_glue_region
+    if region is None:
+        use_region(None)
+        return
+    allowed = clients.is_allowed(region) if clients.loaded else await asyncio.to_thread(clients.is_allowed, region)
+    if not allowed:
+        raise HTTPException(status_code=400, detail=f"Unsupported Glue region {region}")
+    use_region(None if region == clients.default_region else region)
+
+
+app = FastAPI(openapi_url="/crawler/openapi.json", docs_url="/crawler/docs",
+              default_response_class=ORJSONResponse, dependencies=[Depends(select_region)])
+app.add_middleware(IdempotencyMiddleware,
+                   store=SharedStore(shared_backend, ttl=IDEMPOTENCY_TTL) if shared_backend
+                   else MemoryStore(maxsize=IDEMPOTENCY_MAXSIZE, ttl=IDEMPOTENCY_TTL))
+app.add_middleware(MetricsMiddleware)
+register_collector(executor, crawler_cache, start_queue)
+
+
+app.state.draining = False
+
+
+async def warm_up_glue():
+    """Build the Glue client and pre-open pooled connections after startup; readiness does not wait for it."""
+    try:
+        await executor.warm_up(connections=WARM_UP_CONNECTIONS)
+    except Exception as e:
+        startup_times.fail('glue_warm_up', e)
+    else:
+        startup_times.mark('glue_warm_up')
+
+
+def begin_draining():
+    """Fail readiness and release long-polls and event streams, so the server can finish its open connections."""
+    app.state.draining = True
+    run_tracker.close()
+
+
+def drain_on_sigterm():
+    """
+    Chain a SIGTERM handler in front of the server's own. uvicorn stops accepting
+    connections on SIGTERM and then waits for the open ones without a limit before
+    running the shutdown hooks, so a long-poll or event stream would otherwise hold
+    the worker until gunicorn kills it.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        loop.call_soon_threadsafe(begin_draining)
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+@app.on_event("startup")
+def start_inventory():
+    inventory.start()
+    crawler_cache.start()
+    start_queue.start()
+    drain_on_sigterm()
+    if WARM_UP:
+        asyncio.ensure_future(warm_up_glue())
+    startup_times.mark('serving')
+
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """
+    Runs once the server has stopped accepting requests and finished the open ones
+    (released early by SIGTERM, see drain_on_sigterm): stops the background pollers,
+    waits up to shutdown_drain_seconds for Glue calls still running on the pool, then
+    flushes the shared cache writes.
+    """
+    begin_draining()
+    inventory.stop()
+    await start_queue.stop()
+    run_tracker.stop()
+    drained = await executor.drain(SHUTDOWN_DRAIN_SECONDS)
+    executor.shutdown(wait=drained)
+    await crawler_cache.stop()
+    if shared_backend is not None:
+        await shared_backend.close()
+
+
+def bypass_cache(fresh: bool, cache_control: Optional[str]) -> bool:
+    return fresh or (cache_control is not None and 'no-cache' in cache_control.lower())
+
+
+def invalidate_crawler(crawler_name: str, deleted: bool = False):
+    """
+    Drop the cached crawler and every cached listing after a mutation, and bring
+    the crawler's inventory entry up to date when it is in the default region.
+    """
+    region = region_var.get()
+    crawler_cache.pop(('get_crawler', region, crawler_name))
+    for kind in LISTINGS:
+        crawler_cache.pop_prefix((kind, region))
+    if region is None:
+        if deleted:
+            inventory.remove(crawler_name)
+        else:
+            asyncio.ensure_future(refresh_inventory(crawler_name))
+
+
+async def refresh_inventory(crawler_name: str):
+    """Re-read a crawler this service just changed into the inventory; the periodic refresh covers failures."""
+    try:
+        crawler = await batcher.get(crawler_name)
+    except Exception:
+        return
+    if crawler is None:
+        inventory.remove(crawler_name)
+    else:
+        inventory.upsert(crawler)
+
+
+async def start_crawler_by_name(crawler_name: str):
+    response = await executor.call('start_crawler', Name=crawler_name)
+    invalidate_crawler(crawler_name)
+    return response
+
+
+async def select_crawlers(selection: BulkCrawlerSelection) -> list:
+    """Resolve explicit names plus every crawler matching the prefix and tag filters."""
+    names = list(selection.CrawlerNames)
+    if selection.Prefix is not None or selection.Tags:
+        params = {'Tags': selection.Tags} if selection.Tags else {}
+        async for items, _ in executor.paginate('list_crawlers', 'CrawlerNames', **params):
+            names.extend(name for name in items if name.startswith(selection.Prefix or ''))
+    return list(dict.fromkeys(names))
+
+
+async def crawler_item(crawler_name: str, operation: str, semaphore: asyncio.Semaphore,
+                       **params) -> BatchItemResponse:
+    """Run one Glue mutation of a batch, reporting its outcome instead of raising."""
+    async with semaphore:
+        try:
+            response = await executor.call(operation, **params)
+            invalidate_crawler(crawler_name, deleted=operation == 'delete_crawler')
+            return BatchItemResponse(Name=crawler_name, status=response['ResponseMetadata']['HTTPStatusCode'])
+        except botocore.exceptions.ClientError as error:
+            return BatchItemResponse(Name=crawler_name, success=False, status=error.response['ResponseMetadata']['HTTPStatusCode'],
+                                     message=error.response['Error'])
+        except Exception as e:
+            return BatchItemResponse(Name=crawler_name, success=False, status=404, message={"message": "Unhandled Exception"})
+
+
+def success(data, status: int = 200) -> ORJSONResponse:
+    """
+    Render a SuccessResponse body straight with orjson. Glue records are plain
+    dicts, so the pydantic validation and jsonable_encoder copy can be skipped.
+    """
+    return ORJSONResponse({'success': True, 'status': status, 'data': data})
+
+
+def strip_metadata(response: dict) -> dict:
+    return {key: value for key, value in response.items() if key != 'ResponseMetadata'}
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    return [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+
+
+def project(crawler: dict, fields: Optional[List[str]]) -> dict:
+    if fields is None:
+        return crawler
+    return {key: crawler[key] for key in fields if key in crawler}
 
-app = FastAPI(openapi_url="/crawler/openapi.json", docs_url="/crawler/docs")
+
+def ndjson_line(value) -> bytes:
+    return orjson.dumps(value) + b"\n"
+
+
+async def run_events(run):
+    """Server-Sent Events stream of a run's state changes, ending when it completes or the worker drains."""
+    queue = asyncio.Queue()
+    run.subscribers.append(queue)
+    try:
+        yield b"event: state\ndata: " + orjson.dumps(run.snapshot()) + b"\n\n"
+        while not run.done.is_set() and not app.state.draining:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield b"event: state\ndata: " + orjson.dumps(snapshot) + b"\n\n"
+    finally:
+        run.subscribers.remove(queue)
+
+
+async def ndjson_pages(first_page, pages, fields: Optional[List[str]] = None):
+    """
+    Encode paginated Glue items as NDJSON, one item per line, as each page arrives.
+    A trailing {"NextToken": ...} line is emitted when the listing was cut short by limit.
+    """
+    items, next_token = first_page
+    yield b"".join(ndjson_line(project(item, fields)) for item in items)
+    try:
+        async for items, next_token in pages:
+            yield b"".join(ndjson_line(project(item, fields)) for item in items)
+    except botocore.exceptions.ClientError as error:
+        yield ndjson_line(ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error']).dict())
+        return
+    except Exception as e:
+        yield ndjson_line(ExceptionResponse().dict())
+        return
+    if next_token:
+        yield ndjson_line({'NextToken': next_token})
 
 
 @app.post("/crawler/create_s3_crawler")
 async def create_s3_crawler(glue: S3Targets):
     """
     This endpoint creates a Glue crawler for S3 target.
+    S3Path takes one path or a list; RecrawlBehavior=CRAWL_NEW_FOLDERS_ONLY crawls only new folders.
     """
     try:
-        response = client.create_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'S3Targets': [
-                    {
-                        'Path': glue.S3Path
-                    },
-                ]})
+        response = await executor.call('create_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
             return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'])
         else:
@@ -58,17 +385,8 @@ async def create_jdbc_crawler(glue: JdbcTargets):
     This endpoint creates a Glue crawler for JDBC target.
     """
     try:
-        response = client.create_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'JdbcTargets': [
-                    {
-                        'ConnectionName': glue.ConnectionName,
-                        'Path': glue.Path,
-                    },
-                ]})
+        response = await executor.call('create_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
             return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'])
         else:
@@ -95,22 +413,8 @@ async def create_catalog_crawler(glue: CatalogTargets):
     """
 
     try:
-        response = client.create_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            Targets={
-                'CatalogTargets': [
-                    {
-                        'DatabaseName': glue.DatabaseName,
-                        'Tables': [
-                            glue.Tables,
-                        ],
-                    },
-                ]},
-            SchemaChangePolicy={
-                'UpdateBehavior': glue.UpdateBehavior,
-                'DeleteBehavior': glue.DeleteBehavior
-            })
+        response = await executor.call('create_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
             return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'])
         else:
@@ -136,18 +440,36 @@ async def create_delta_crawler(glue: DeltaTargets):
     This endpoint creates a Glue crawler for delta target.
     """
     try:
-        response = client.create_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'DeltaTargets': [
-                    {
-                        'DeltaTables': [
-                            glue.DeltaTables,
-                        ],
-                    },
-                ]})
+        response = await executor.call('create_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
+        if response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'])
+        else:
+            return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'InvalidInputException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'AlreadyExistsException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'ResourceNumberLimitExceededException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.post("/crawler/create_crawler")
+async def create_crawler(glue: MixedTargets):
+    """
+    This endpoint creates a Glue crawler for any mix of S3, JDBC and delta targets,
+    or for catalog targets.
+    """
+    try:
+        response = await executor.call('create_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
             return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'])
         else:
@@ -167,15 +489,90 @@ async def create_delta_crawler(glue: DeltaTargets):
         return ExceptionResponse()
 
 
-@app.get('/crawler/get_crawlers')
-async def get_crawlers():
+@app.post("/crawler/batch/create")
+async def batch_create_crawlers(batch: BatchCreateCrawlers):
+    """
+    This endpoint creates many Glue crawlers at once from a mixed list of
+    S3Targets, JdbcTargets, CatalogTargets and DeltaTargets payloads.
+    The create_crawler calls run concurrently, bounded by batch_concurrency.
+    """
+    duplicates = [name for name, count in Counter(glue.Name for glue in batch.Crawlers).items() if count > 1]
+    if duplicates:
+        return ErrorResponse(status=400, message={"message": "Duplicate crawler names in batch", "Names": duplicates})
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    results = await asyncio.gather(*(crawler_item(glue.Name, 'create_crawler', semaphore, **glue.crawler_params())
+                                     for glue in batch.Crawlers))
+    return SuccessResponse(data={
+        'Succeeded': sum(result.success for result in results),
+        'Failed': sum(not result.success for result in results),
+        'Results': [result.dict() for result in results],
+    })
+
+
+@app.post("/crawler/sync")
+async def sync_crawlers(spec: SyncCrawlers, dry_run: bool = False):
+    """
+    This endpoint reconciles Glue with the desired crawler specs, issuing
+    create/update calls only for crawlers that are missing or differ.
+    With Prune, crawlers whose name starts with Prefix and that are not in the
+    specs are deleted. dry_run=true returns the plan without applying it.
+    """
+    try:
+        current, _ = await batcher.fetch([glue.Name for glue in spec.Crawlers])
+        managed = await select_crawlers(BulkCrawlerSelection(Prefix=spec.Prefix)) if spec.Prune else None
+        plan = plan_sync(spec.Crawlers, current, managed)
+        if dry_run:
+            return SuccessResponse(data={'Plan': plan})
+        specs = {glue.Name: glue for glue in spec.Crawlers}
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        actions = ([('Create', crawler_item(name, 'create_crawler', semaphore, **specs[name].crawler_params()))
+                    for name in plan['Create']]
+                   + [('Update', crawler_item(item['Name'], 'update_crawler', semaphore, **specs[item['Name']].crawler_params()))
+                      for item in plan['Update']]
+                   + [('Delete', crawler_item(name, 'delete_crawler', semaphore, Name=name))
+                      for name in plan['Delete']])
+        results = await asyncio.gather(*(coroutine for _, coroutine in actions))
+        return SuccessResponse(data={'Plan': plan, 'Results': [dict(result.dict(), Action=action)
+                                                              for (action, _), result in zip(actions, results)]})
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'InvalidInputException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/get_crawlers', responses={200: {'model': CrawlersResponse}})
+async def get_crawlers(limit: Optional[int] = Query(None, ge=1), next_token: Optional[str] = None,
+                       stream: bool = False, fresh: bool = False,
+                       fields: Optional[str] = Query(None, description="Comma-separated crawler fields to return, e.g. Name,State"),
+                       cache_control: Optional[str] = Header(None)):
     """
-    This endpoint return the all Glue crawler.
+    This endpoint return the all Glue crawler, following every NextToken page.
+    Pass limit/next_token to page on the client side and stream=true to receive NDJSON as pages arrive.
+    Results are cached; fresh=true or Cache-Control: no-cache bypasses the cache.
     The supported target types are: S3Targets, JdbcTargets, CatalogTargets, DeltaTargets.
     """
+    field_list = parse_fields(fields)
+    cache_key = ('get_crawlers', region_var.get(), limit, next_token)
+    if not stream and not bypass_cache(fresh, cache_control):
+        data = await crawler_cache.fetch(cache_key)
+        if data is not None:
+            return success({'Crawlers': [project(crawler, field_list) for crawler in data['Crawlers']],
+                            'NextToken': data['NextToken']})
     try:
-        response = client.get_crawlers()
-        return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+        pages = executor.paginate('get_crawlers', 'Crawlers', limit=limit, next_token=next_token)
+        first_page = await pages.__anext__()
+        if stream:
+            return StreamingResponse(ndjson_pages(first_page, pages, field_list), media_type="application/x-ndjson")
+        crawlers, next_token = first_page
+        async for items, next_token in pages:
+            crawlers.extend(items)
+        crawler_cache.set(cache_key, {'Crawlers': crawlers, 'NextToken': next_token})
+        return success({'Crawlers': [project(crawler, field_list) for crawler in crawlers], 'NextToken': next_token})
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == 'OperationTimeoutException':
             return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
@@ -185,19 +582,54 @@ async def get_crawlers():
         return ExceptionResponse()
 
 
-@app.get('/crawler/get_crawler/{crawler_name}')
-async def get_crawler(crawler_name: str):
+@app.get('/crawler/get_crawler/{crawler_name}', responses={200: {'model': CrawlerResponse}})
+async def get_crawler(crawler_name: str, fresh: bool = False,
+                      fields: Optional[str] = Query(None, description="Comma-separated crawler fields to return, e.g. Name,State"),
+                      cache_control: Optional[str] = Header(None)):
     """
     This endpoint return the Glue crawler based on param.
+    Concurrent lookups are coalesced into a single BatchGetCrawlers call.
+    Results are cached; fresh=true or Cache-Control: no-cache bypasses the cache.
     The supported target types are: S3Targets, JdbcTargets, CatalogTargets, DeltaTargets.
     """
+    cache_key = ('get_crawler', region_var.get(), crawler_name)
+    if not bypass_cache(fresh, cache_control):
+        crawler = await crawler_cache.fetch(cache_key)
+        if crawler is not None:
+            return success({'Crawler': project(crawler, parse_fields(fields))})
     try:
-        response = client.get_crawler(
-            Name=crawler_name
-        )
-        return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+        crawler = await batcher.get(crawler_name)
+        if crawler is None:
+            return ExceptionResponse(status=400, message={'Code': 'EntityNotFoundException',
+                                                          'Message': f'Crawler entry with name {crawler_name} does not exist'})
+        crawler_cache.set(cache_key, crawler)
+        return success({'Crawler': project(crawler, parse_fields(fields))})
     except botocore.exceptions.ClientError as error:
-        if error.response['Error']['Code'] == 'EntityNotFoundException':
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.post('/crawler/batch_get', responses={200: {'model': CrawlersResponse}})
+async def batch_get_crawlers(batch: BatchGetCrawlers,
+                             fields: Optional[str] = Query(None, description="Comma-separated crawler fields to return, e.g. Name,State")):
+    """
+    This endpoint return many Glue crawlers by name using BatchGetCrawlers,
+    fetched in parallel chunks of 100 names.
+    Names Glue does not know are reported in CrawlersNotFound.
+    """
+    try:
+        found, not_found = await batcher.fetch(batch.CrawlerNames)
+        for name, crawler in found.items():
+            crawler_cache.set(('get_crawler', region_var.get(), name), crawler)
+        field_list = parse_fields(fields)
+        return success({'Crawlers': [project(crawler, field_list) for crawler in found.values()],
+                        'CrawlersNotFound': not_found})
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'InvalidInputException':
             return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
         if error.response['Error']['Code'] == 'OperationTimeoutException':
             return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
@@ -207,15 +639,32 @@ async def get_crawler(crawler_name: str):
         return ExceptionResponse()
 
 
-@app.get('/crawler/list_crawlers')
-async def list_crawlers():
+@app.get('/crawler/list_crawlers', responses={200: {'model': CrawlerNamesResponse}})
+async def list_crawlers(limit: Optional[int] = Query(None, ge=1), next_token: Optional[str] = None,
+                        stream: bool = False, fresh: bool = False,
+                        cache_control: Optional[str] = Header(None)):
     """
-    This endpoint return the List of all Glue crawler.
+    This endpoint return the List of all Glue crawler, following every NextToken page.
+    Pass limit/next_token to page on the client side and stream=true to receive NDJSON as pages arrive.
+    Results are cached; fresh=true or Cache-Control: no-cache bypasses the cache.
     The supported target types are: S3Targets, JdbcTargets, CatalogTargets, DeltaTargets.
     """
+    cache_key = ('list_crawlers', region_var.get(), limit, next_token)
+    if not stream and not bypass_cache(fresh, cache_control):
+        data = await crawler_cache.fetch(cache_key)
+        if data is not None:
+            return success(data)
     try:
-        response = client.list_crawlers()
-        return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+        pages = executor.paginate('list_crawlers', 'CrawlerNames', limit=limit, next_token=next_token)
+        first_page = await pages.__anext__()
+        if stream:
+            return StreamingResponse(ndjson_pages(first_page, pages), media_type="application/x-ndjson")
+        crawler_names, next_token = first_page
+        async for items, next_token in pages:
+            crawler_names.extend(items)
+        data = {'CrawlerNames': crawler_names, 'NextToken': next_token}
+        crawler_cache.set(cache_key, data)
+        return success(data)
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == 'OperationTimeoutException':
             return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
@@ -226,13 +675,20 @@ async def list_crawlers():
 
 
 @app.get('/crawler/start_crawler/{crawler_name}')
-async def start_crawlers(crawler_name: str):
+async def start_crawlers(crawler_name: str, wait: bool = False,
+                         timeout: float = Query(300, gt=0, le=MAX_WAIT_SECONDS)):
     """
     This endpoint run the Glue crawler based on param.
+    With wait=true the request blocks until the run completes or timeout seconds pass.
     The supported target types are: S3Targets, JdbcTargets, CatalogTargets, DeltaTargets.
     """
     try:
-        response = client.start_crawler(Name=crawler_name)
+        response = await executor.call('start_crawler', Name=crawler_name)
+        invalidate_crawler(crawler_name)
+        if wait:
+            run = run_tracker.watch(crawler_name, started=True, region=region_var.get())
+            await run_tracker.wait(run, timeout)
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=run.snapshot())
         return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data={"message": "Crawler started successfully"})
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == 'EntityNotFoundException':
@@ -247,6 +703,62 @@ async def start_crawlers(crawler_name: str):
         return ExceptionResponse()
 
 
+@app.get('/crawler/runs')
+async def list_runs():
+    """
+    This endpoint return the crawler runs tracked by the shared run poller.
+    """
+    return SuccessResponse(data={'Runs': [run.snapshot() for run in run_tracker.runs.values()]})
+
+
+@app.post('/crawler/runs/{crawler_name}')
+async def start_run(crawler_name: str):
+    """
+    This endpoint run the Glue crawler based on param and tracks it until completion.
+    Poll GET /crawler/runs/{crawler_name} or subscribe to its events for the outcome.
+    """
+    try:
+        response = await executor.call('start_crawler', Name=crawler_name)
+        invalidate_crawler(crawler_name)
+        run = run_tracker.watch(crawler_name, started=True, region=region_var.get())
+        return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=run.snapshot())
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'EntityNotFoundException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'CrawlerRunningException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/runs/{crawler_name}')
+async def get_run(crawler_name: str, wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS)):
+    """
+    This endpoint return the tracked run of the Glue crawler based on param.
+    Crawlers not yet tracked are added to the poller. With wait > 0 the request
+    long-polls for up to wait seconds until the run completes.
+    """
+    run = run_tracker.get(crawler_name, region_var.get()) or run_tracker.watch(crawler_name, region=region_var.get())
+    if wait:
+        await run_tracker.wait(run, wait)
+    return SuccessResponse(data=run.snapshot())
+
+
+@app.get('/crawler/runs/{crawler_name}/events')
+async def run_events_stream(crawler_name: str):
+    """
+    This endpoint streams the state changes of the Glue crawler run as Server-Sent Events
+    and closes the stream once the run completes.
+    """
+    run = run_tracker.get(crawler_name, region_var.get()) or run_tracker.watch(crawler_name, region=region_var.get())
+    return StreamingResponse(run_events(run), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache'})
+
+
 @app.get('/crawler/stop_crawler/{crawler_name}')
 async def stop_crawlers(crawler_name: str):
     """
@@ -254,8 +766,8 @@ async def stop_crawlers(crawler_name: str):
     The supported target types are: S3Targets, JdbcTargets, CatalogTargets, DeltaTargets.
     """
     try:
-        response = client.stop_crawler(Name=crawler_name)
-        print('res', response)
+        response = await executor.call('stop_crawler', Name=crawler_name)
+        invalidate_crawler(crawler_name)
         return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data={"message": "Crawler stopped successfully"})
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == 'EntityNotFoundException':
@@ -272,24 +784,69 @@ async def stop_crawlers(crawler_name: str):
         return ExceptionResponse()
 
 
+@app.post('/crawler/bulk/start')
+async def bulk_start_crawlers(selection: BulkCrawlerSelection):
+    """
+    This endpoint queues many Glue crawlers for starting, selected by name, name prefix or tags.
+    At most max_running_crawlers run at once; the next queued crawler starts as soon as one finishes.
+    """
+    try:
+        queued, skipped = await start_queue.enqueue(await select_crawlers(selection), region=region_var.get())
+        return SuccessResponse(data={'Queued': queued, 'Skipped': skipped, 'Queue': start_queue.stats()})
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.post('/crawler/bulk/stop')
+async def bulk_stop_crawlers(selection: BulkCrawlerSelection):
+    """
+    This endpoint stops many Glue crawlers, selected by name, name prefix or tags.
+    Crawlers still waiting in the start queue are removed from it instead of being stopped.
+    """
+    try:
+        names = await select_crawlers(selection)
+        cancelled = await start_queue.cancel(names, region=region_var.get())
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        results = await asyncio.gather(*(crawler_item(name, 'stop_crawler', semaphore, Name=name)
+                                         for name in names if name not in cancelled))
+        return SuccessResponse(data={'Cancelled': cancelled, 'Results': [result.dict() for result in results]})
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/bulk/queue')
+async def bulk_queue():
+    """
+    This endpoint return the bulk start queue: depth, wait times, and the queued, running and failed
+    crawlers of the selected region.
+    """
+    try:
+        return SuccessResponse(data=await start_queue.snapshot(region_var.get()))
+    except Exception as e:
+        return ExceptionResponse()
+
+
 @app.put("/crawler/update_s3_crawler")
 async def update_s3_crawler(glue: S3Targets):
     """
     This endpoint update a Glue crawler for S3 target.
+    S3Path takes one path or a list; RecrawlBehavior=CRAWL_NEW_FOLDERS_ONLY crawls only new folders.
     """
     try:
-        response = client.update_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'S3Targets': [
-                    {
-                        'Path': glue.S3Path
-                    },
-                ]})
+        response = await executor.call('update_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
-            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=strip_metadata(response))
         else:
             return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
     except botocore.exceptions.ClientError as error:
@@ -316,19 +873,10 @@ async def update_jdbc_crawler(glue: JdbcTargets):
     """
 
     try:
-        response = client.update_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'JdbcTargets': [
-                    {
-                        'ConnectionName': glue.ConnectionName,
-                        'Path': glue.Path,
-                    },
-                ]})
+        response = await executor.call('update_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
-            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=strip_metadata(response))
         else:
             return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
     except botocore.exceptions.ClientError as error:
@@ -355,24 +903,10 @@ async def update_catalog_crawler(glue: CatalogTargets):
     """
 
     try:
-        response = client.update_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            Targets={
-                'CatalogTargets': [
-                    {
-                        'DatabaseName': glue.DatabaseName,
-                        'Tables': [
-                            glue.Tables,
-                        ],
-                    },
-                ]},
-            SchemaChangePolicy={
-                'UpdateBehavior': glue.UpdateBehavior,
-                'DeleteBehavior': glue.DeleteBehavior
-            })
+        response = await executor.call('update_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
-            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=strip_metadata(response))
         else:
             return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
     except botocore.exceptions.ClientError as error:
@@ -398,20 +932,10 @@ async def update_delta_crawler(glue: DeltaTargets):
     This endpoint update a Glue crawler for delta target.
     """
     try:
-        response = client.update_crawler(
-            Name=glue.Name,
-            Role=glue.Role,
-            DatabaseName=glue.DatabaseName,
-            Targets={
-                'DeltaTargets': [
-                    {
-                        'DeltaTables': [
-                            glue.DeltaTables,
-                        ],
-                    },
-                ]})
+        response = await executor.call('update_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
         if response['ResponseMetadata']['HTTPStatusCode'] == 200:
-            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=strip_metadata(response))
         else:
             return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
     except botocore.exceptions.ClientError as error:
@@ -429,3 +953,168 @@ async def update_delta_crawler(glue: DeltaTargets):
             return ExceptionResponse()
     except Exception as e:
         return ExceptionResponse()
+
+
+@app.put("/crawler/update_crawler")
+async def update_crawler(glue: MixedTargets):
+    """
+    This endpoint update a Glue crawler for any mix of S3, JDBC and delta targets,
+    or for catalog targets. The given targets replace all existing ones.
+    """
+    try:
+        response = await executor.call('update_crawler', **glue.crawler_params())
+        invalidate_crawler(glue.Name)
+        if response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            return SuccessResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=strip_metadata(response))
+        else:
+            return ErrorResponse(status=response['ResponseMetadata']['HTTPStatusCode'], data=response)
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'InvalidInputException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'VersionMismatchException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'EntityNotFoundException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'CrawlerRunningException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/search', responses={200: {'model': CrawlersResponse}})
+async def search_crawlers(name_prefix: Optional[str] = None, path_prefix: Optional[str] = None,
+                          database: Optional[str] = None, connection: Optional[str] = None,
+                          state: Optional[str] = None, last_status: Optional[str] = None,
+                          limit: int = Query(100, ge=1, le=10000),
+                          fields: Optional[str] = Query(None, description="Comma-separated crawler fields to return, e.g. Name,State")):
+    """
+    This endpoint searches the local crawler inventory by name or target path prefix,
+    database, connection, state and last crawl status without calling Glue.
+    The inventory covers the default region only and is refreshed every inventory_refresh_seconds;
+    crawlers changed through this service are updated in it right away.
+    """
+    if region_var.get() is not None:
+        return ExceptionResponse(status=400, message={"message": "The crawler inventory only covers the default region"})
+    if not await inventory.wait_ready(timeout=30):
+        return ExceptionResponse(status=503, message={"message": "Crawler inventory is not loaded yet"})
+    crawlers = inventory.search(name_prefix=name_prefix, path_prefix=path_prefix, database=database,
+                                connection=connection, state=state, last_status=last_status)
+    field_list = parse_fields(fields)
+    return success({'Crawlers': [project(crawler, field_list) for crawler in crawlers[:limit]],
+                    'Count': len(crawlers), 'RefreshedAt': inventory.refreshed_at})
+
+
+@app.get('/crawler/stats')
+async def crawler_stats(prefix: Optional[str] = None, days: Optional[float] = Query(None, gt=0),
+                        sort: str = Query('MedianRuntimeSeconds', regex='^(MedianRuntimeSeconds|LastRuntimeSeconds|TablesChanged)$'),
+                        top: int = Query(50, ge=1, le=1000), fresh: bool = False):
+    """
+    This endpoint ranks every crawler, or those whose name starts with prefix, by Glue's crawler metrics
+    (sort, descending) and returns the top ones with their run history summary: median/p95 runtime,
+    DPU hours, tables changed per run and failure rate. Summary covers every crawler's metrics,
+    TopSummary the runs of the returned crawlers; days limits those runs to the last N days.
+    Run history and metrics are cached for history_cache_ttl_seconds; fresh=true refetches them.
+    """
+    try:
+        names = await select_crawlers(BulkCrawlerSelection(Prefix=prefix or ''))
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        return success(await history.fleet(names, rank_by=sort, top=top, since=since, fresh=fresh))
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/{crawler_name}/history')
+async def crawler_history(crawler_name: str, days: Optional[float] = Query(None, gt=0),
+                          limit: int = Query(100, ge=1, le=10000), fresh: bool = False):
+    """
+    This endpoint return the run history of the Glue crawler based on param, newest first,
+    with Glue's crawler metrics and a summary: median/p95 runtime, DPU hours,
+    tables changed per run and failure rate. days limits the runs to the last N days.
+    """
+    try:
+        since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+        crawls, metrics = await asyncio.gather(history.crawls(crawler_name, since=since, fresh=fresh),
+                                               history.metrics([crawler_name], fresh=fresh))
+        return success({'CrawlerName': crawler_name, 'Summary': summarize(crawls),
+                        'Metrics': metrics.get(crawler_name), 'Crawls': crawls[:limit]})
+    except botocore.exceptions.ClientError as error:
+        if error.response['Error']['Code'] == 'EntityNotFoundException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        if error.response['Error']['Code'] == 'OperationTimeoutException':
+            return ExceptionResponse(status=error.response['ResponseMetadata']['HTTPStatusCode'], message=error.response['Error'])
+        else:
+            return ExceptionResponse()
+    except Exception as e:
+        return ExceptionResponse()
+
+
+@app.get('/crawler/healthz')
+async def healthz():
+    """
+    This endpoint reports that the process is serving requests. It does not call Glue.
+    """
+    return success({'status': 'ok'})
+
+
+@app.get('/crawler/readyz')
+async def readyz():
+    """
+    This endpoint reports whether this worker should receive traffic, i.e. it has not received SIGTERM;
+    from then on it answers 503 on the connections still open. It does not call Glue. An unreachable shared backend is reported but does not fail
+    the check, since the cache and rate limiter fall back to per-process state.
+    """
+    checks = {'draining': app.state.draining}
+    if shared_backend is not None:
+        try:
+            checks['shared_backend'] = await asyncio.wait_for(shared_backend.ping(), 1)
+        except Exception:
+            checks['shared_backend'] = False
+    if checks['draining']:
+        return ORJSONResponse(ExceptionResponse(status=503, message=checks).dict(), status_code=503)
+    return success(checks)
+
+
+@app.get('/crawler/cache/stats')
+async def cache_stats():
+    """
+    This endpoint return the hit/miss/eviction counters of the crawler metadata cache.
+    """
+    return SuccessResponse(data=crawler_cache.stats())
+
+
+@app.get('/crawler/ratelimit/stats')
+async def ratelimit_stats():
+    """
+    This endpoint return the current per-operation Glue request rate and the retry counters.
+    """
+    return SuccessResponse(data={'operations': executor.limiter.stats(), 'retry': executor.retry.stats()})
+
+
+@app.get('/crawler/startup')
+async def startup_stats():
+    """
+    This endpoint return the seconds from process start to each startup phase of this worker
+    (imported, serving, glue_warm_up) and how long building each region's Glue client took.
+    """
+    return SuccessResponse(data=dict(startup_times.stats(), client_build_seconds={
+        region or 'default': round(seconds, 4) for region, seconds in clients.build_seconds.items()}))
+
+
+@app.get('/crawler/metrics')
+async def metrics():
+    """
+    This endpoint exports the service metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+startup_times.mark('imported')
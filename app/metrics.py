@@ -0,0 +1,114 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import REGISTRY
+
+REQUESTS = Counter('crawler_http_requests_total', 'HTTP requests handled.',
+                   ['method', 'route', 'status'])
+REQUEST_LATENCY = Histogram('crawler_http_request_duration_seconds', 'HTTP request latency.',
+                            ['method', 'route'])
+REQUESTS_IN_FLIGHT = Gauge('crawler_http_requests_in_flight', 'HTTP requests being handled.')
+GLUE_CALL_LATENCY = Histogram('crawler_glue_call_duration_seconds',
+                              'Glue API call latency by operation and result code.',
+                              ['operation', 'code'])
+IDEMPOTENT_REQUESTS = Counter('crawler_idempotent_requests_total',
+                              'Requests carrying an Idempotency-Key by outcome: executed, replayed, collapsed, conflict.',
+                              ['outcome'])
+STARTUP_SECONDS = Gauge('crawler_startup_seconds', 'Seconds from process start to each startup phase.', ['phase'])
+
+
+def observe_glue_call(operation: str, code: str, seconds: float):
+    GLUE_CALL_LATENCY.labels(operation, code).observe(seconds)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, latency and in-flight requests
+    per route template. Paths that match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.routes = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = self.route(scope)
+            REQUEST_LATENCY.labels(scope['method'], route).observe(time.perf_counter() - start)
+            REQUESTS.labels(scope['method'], route, status).inc()
+
+    def route(self, scope) -> str:
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return 'unmatched'
+        if endpoint not in self.routes:
+            app = scope.get('app')
+            for route in getattr(app, 'routes', []):
+                if getattr(route, 'endpoint', None) is endpoint:
+                    self.routes[endpoint] = route.path
+                    break
+            else:
+                self.routes[endpoint] = 'unmatched'
+        return self.routes[endpoint]
+
+
+class ServiceCollector:
+    """Exports the executor, cache, rate limiter and start queue counters at scrape time."""
+
+    def __init__(self, executor, cache, start_queue):
+        self.executor = executor
+        self.cache = cache
+        self.start_queue = start_queue
+
+    def collect(self):
+        yield GaugeMetricFamily('crawler_glue_calls_in_flight', 'Glue calls submitted to the executor.',
+                                value=self.executor.in_flight)
+        yield GaugeMetricFamily('crawler_executor_queue_depth', 'Glue calls waiting for a worker thread.',
+                                value=self.executor.queue_depth)
+
+        cache = self.cache.stats()
+        yield GaugeMetricFamily('crawler_cache_entries', 'Entries in the crawler cache.', value=cache['size'])
+        for name in ('hits', 'misses', 'evictions'):
+            yield CounterMetricFamily(f'crawler_cache_{name}', f'Crawler cache {name}.', value=cache[name])
+
+        rate = GaugeMetricFamily('crawler_glue_rate_limit', 'Current client-side Glue request rate.',
+                                 labels=['operation'])
+        throttled = CounterMetricFamily('crawler_glue_throttled', 'Throttled Glue calls.', labels=['operation'])
+        for operation, stats in self.executor.limiter.stats().items():
+            rate.add_metric([operation], stats['rate'])
+            throttled.add_metric([operation], stats['throttled'])
+        yield rate
+        yield throttled
+        retry = self.executor.retry.stats()
+        yield CounterMetricFamily('crawler_glue_retries', 'Retried Glue calls.', value=retry['retries'])
+        yield CounterMetricFamily('crawler_glue_retries_exhausted', 'Glue calls that ran out of retries.',
+                                  value=retry['exhausted'])
+
+        queue = self.start_queue.stats()
+        yield GaugeMetricFamily('crawler_start_queue_depth', 'Crawlers waiting to be started.',
+                                value=queue['queue_depth'])
+        yield GaugeMetricFamily('crawler_start_queue_running', 'Crawlers started by the queue still running.',
+                                value=queue['running'])
+        yield GaugeMetricFamily('crawler_start_queue_oldest_wait_seconds', 'Wait time of the oldest queued crawler.',
+                                value=queue['oldest_wait_seconds'])
+
+
+def register_collector(executor, cache, start_queue):
+    REGISTRY.register(ServiceCollector(executor, cache, start_queue))
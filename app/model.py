@@ -1,31 +1,170 @@
-from typing import Optional, Union
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator, validator
 
 
-class Glue_crawler(BaseModel):
+def as_list(value):
+    return [value] if isinstance(value, str) else value
+
+
+class S3Target(BaseModel):
+    Path: str
+    Exclusions: List[str] = []
+    SampleSize: Optional[int] = Field(None, ge=1, le=249)
+
+
+class JdbcTarget(BaseModel):
+    ConnectionName: str
+    Path: str
+    Exclusions: List[str] = []
+
+
+class CatalogTarget(BaseModel):
+    DatabaseName: str
+    Tables: List[str] = Field(min_items=1)
+
+
+class DeltaTarget(BaseModel):
+    DeltaTables: List[str] = Field(min_items=1)
+    ConnectionName: Optional[str] = None
+    WriteManifest: bool = False
+
+
+class Glue_crawler(BaseModel, ABC):
     Name: str = Field(min_length=1, max_length=255)
     Role: str
     DatabaseName: str
+    RecrawlBehavior: Optional[Literal['CRAWL_EVERYTHING', 'CRAWL_NEW_FOLDERS_ONLY', 'CRAWL_EVENT_MODE']] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_recrawl_behavior(cls, values):
+        # Glue only accepts incremental crawls of S3 targets with a log-only schema change policy.
+        if values.get('RecrawlBehavior') == 'CRAWL_NEW_FOLDERS_ONLY':
+            if not cls.s3_only(values):
+                raise ValueError('CRAWL_NEW_FOLDERS_ONLY is only supported for S3 targets')
+            if any(values.get(key) not in (None, 'LOG') for key in ('UpdateBehavior', 'DeleteBehavior')):
+                raise ValueError('CRAWL_NEW_FOLDERS_ONLY requires UpdateBehavior and DeleteBehavior LOG')
+        return values
+
+    @classmethod
+    def s3_only(cls, values: dict) -> bool:
+        return False
+
+    @abstractmethod
+    def targets(self) -> dict:
+        """The Targets argument of the Glue create_crawler/update_crawler calls."""
+
+    def crawler_params(self) -> dict:
+        """Keyword arguments for the Glue create_crawler/update_crawler calls."""
+        params = {'Name': self.Name, 'Role': self.Role, 'DatabaseName': self.DatabaseName,
+                  'Targets': self.targets()}
+        if self.RecrawlBehavior is not None:
+            params['RecrawlPolicy'] = {'RecrawlBehavior': self.RecrawlBehavior}
+            if self.RecrawlBehavior == 'CRAWL_NEW_FOLDERS_ONLY':
+                params['SchemaChangePolicy'] = {'UpdateBehavior': 'LOG', 'DeleteBehavior': 'LOG'}
+        return params
 
 
 class S3Targets(Glue_crawler):
-    S3Path: str
+    S3Path: List[str] = Field(min_items=1)
+    Exclusions: List[str] = []
+    SampleSize: Optional[int] = Field(None, ge=1, le=249)
+
+    _s3_path_list = validator('S3Path', pre=True, allow_reuse=True)(as_list)
+
+    @classmethod
+    def s3_only(cls, values: dict) -> bool:
+        return True
+
+    def targets(self) -> dict:
+        return {'S3Targets': [S3Target(Path=path, Exclusions=self.Exclusions,
+                                       SampleSize=self.SampleSize).dict(exclude_defaults=True)
+                              for path in self.S3Path]}
 
 
 class JdbcTargets(Glue_crawler):
     ConnectionName: str
-    Path: str
+    Path: List[str] = Field(min_items=1)
+    Exclusions: List[str] = []
+
+    _path_list = validator('Path', pre=True, allow_reuse=True)(as_list)
+
+    def targets(self) -> dict:
+        return {'JdbcTargets': [JdbcTarget(ConnectionName=self.ConnectionName, Path=path,
+                                           Exclusions=self.Exclusions).dict(exclude_defaults=True)
+                                for path in self.Path]}
 
 
 class CatalogTargets(Glue_crawler):
-    Tables: str
+    Tables: List[str] = Field(min_items=1)
     UpdateBehavior: Optional[str] = "LOG"
     DeleteBehavior: Optional[str] = "LOG"
 
+    _tables_list = validator('Tables', pre=True, allow_reuse=True)(as_list)
+
+    def targets(self) -> dict:
+        return {'CatalogTargets': [{'DatabaseName': self.DatabaseName, 'Tables': self.Tables}]}
+
+    def crawler_params(self) -> dict:
+        params = super().crawler_params()
+        del params['DatabaseName']
+        params['SchemaChangePolicy'] = {'UpdateBehavior': self.UpdateBehavior,
+                                        'DeleteBehavior': self.DeleteBehavior}
+        return params
+
 
 class DeltaTargets(Glue_crawler):
-    DeltaTables: str
+    DeltaTables: List[str] = Field(min_items=1)
+
+    _delta_tables_list = validator('DeltaTables', pre=True, allow_reuse=True)(as_list)
+
+    def targets(self) -> dict:
+        return {'DeltaTargets': [{'DeltaTables': self.DeltaTables}]}
+
+
+class MixedTargets(Glue_crawler):
+    S3Targets: List[S3Target] = []
+    JdbcTargets: List[JdbcTarget] = []
+    CatalogTargets: List[CatalogTarget] = []
+    DeltaTargets: List[DeltaTarget] = []
+    UpdateBehavior: Optional[str] = None
+    DeleteBehavior: Optional[str] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_targets(cls, values):
+        stores = values['S3Targets'] + values['JdbcTargets'] + values['DeltaTargets']
+        if not stores and not values['CatalogTargets']:
+            raise ValueError('At least one target is required')
+        if stores and values['CatalogTargets']:
+            raise ValueError('CatalogTargets cannot be combined with other target types')
+        return values
+
+    @classmethod
+    def s3_only(cls, values: dict) -> bool:
+        return bool(values['S3Targets']) and not (values['JdbcTargets'] or values['CatalogTargets']
+                                                  or values['DeltaTargets'])
+
+    def targets(self) -> dict:
+        targets = {'S3Targets': self.S3Targets, 'JdbcTargets': self.JdbcTargets,
+                   'CatalogTargets': self.CatalogTargets, 'DeltaTargets': self.DeltaTargets}
+        return {key: [target.dict(exclude_defaults=True) for target in value]
+                for key, value in targets.items() if value}
+
+    def crawler_params(self) -> dict:
+        params = super().crawler_params()
+        if self.CatalogTargets:
+            del params['DatabaseName']
+        if self.UpdateBehavior is not None or self.DeleteBehavior is not None:
+            params.setdefault('SchemaChangePolicy', {}).update(
+                {key: value for key, value in (('UpdateBehavior', self.UpdateBehavior),
+                                               ('DeleteBehavior', self.DeleteBehavior)) if value is not None})
+        return params
+
+
+class BatchCreateCrawlers(BaseModel):
+    Crawlers: List[Union[S3Targets, JdbcTargets, CatalogTargets, DeltaTargets, MixedTargets]] = Field(min_items=1, max_items=1000)
 
 
 class SuccessResponse(BaseModel):
@@ -34,6 +173,65 @@ class SuccessResponse(BaseModel):
     data: Union[None, dict, list] = None
 
 
+class LastCrawl(BaseModel):
+    Status: Optional[str] = None
+    ErrorMessage: Optional[str] = None
+    LogGroup: Optional[str] = None
+    LogStream: Optional[str] = None
+    MessagePrefix: Optional[str] = None
+    StartTime: Optional[datetime] = None
+
+
+class CrawlerRecord(BaseModel):
+    Name: str
+    Role: Optional[str] = None
+    Targets: Optional[dict] = None
+    DatabaseName: Optional[str] = None
+    Description: Optional[str] = None
+    Classifiers: Optional[List[str]] = None
+    RecrawlPolicy: Optional[dict] = None
+    SchemaChangePolicy: Optional[dict] = None
+    LineageConfiguration: Optional[dict] = None
+    State: Optional[str] = None
+    TablePrefix: Optional[str] = None
+    Schedule: Optional[dict] = None
+    CrawlElapsedTime: Optional[int] = None
+    CreationTime: Optional[datetime] = None
+    LastUpdated: Optional[datetime] = None
+    LastCrawl: Optional[LastCrawl] = None
+    Version: Optional[int] = None
+    Configuration: Optional[str] = None
+    CrawlerSecurityConfiguration: Optional[str] = None
+    LakeFormationConfiguration: Optional[dict] = None
+
+
+class CrawlerData(BaseModel):
+    Crawler: CrawlerRecord
+
+
+class CrawlersData(BaseModel):
+    Crawlers: List[CrawlerRecord]
+    NextToken: Optional[str] = None
+    CrawlersNotFound: Optional[List[str]] = None
+
+
+class CrawlerNamesData(BaseModel):
+    CrawlerNames: List[str]
+    NextToken: Optional[str] = None
+
+
+class CrawlerResponse(SuccessResponse):
+    data: CrawlerData
+
+
+class CrawlersResponse(SuccessResponse):
+    data: CrawlersData
+
+
+class CrawlerNamesResponse(SuccessResponse):
+    data: CrawlerNamesData
+
+
 class ErrorResponse(BaseModel):
     success: bool = False
     status: int = 404
@@ -44,3 +242,41 @@ class ExceptionResponse(BaseModel):
     success: bool = False
     status: int = 404
     message: Union[None, dict, list] = {"message": "Unhandled Exception"}
+
+
+class BatchGetCrawlers(BaseModel):
+    CrawlerNames: List[str] = Field(min_items=1, max_items=1000)
+
+
+class BulkCrawlerSelection(BaseModel):
+    CrawlerNames: List[str] = []
+    Prefix: Optional[str] = None
+    Tags: Optional[Dict[str, str]] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_selection(cls, values):
+        if not values.get('CrawlerNames') and values.get('Prefix') is None and not values.get('Tags'):
+            raise ValueError('CrawlerNames, Prefix or Tags is required')
+        return values
+
+
+class SyncCrawlers(BaseModel):
+    Crawlers: List[Union[S3Targets, JdbcTargets, CatalogTargets, DeltaTargets, MixedTargets]] = Field(max_items=1000)
+    Prune: bool = False
+    Prefix: Optional[str] = None
+
+    @root_validator(skip_on_failure=True)
+    def check_prune(cls, values):
+        if values.get('Prune') and not values.get('Prefix'):
+            raise ValueError('Prefix is required to Prune crawlers')
+        names = [glue.Name for glue in values.get('Crawlers', [])]
+        if len(names) != len(set(names)):
+            raise ValueError('Crawler names must be unique')
+        return values
+
+
+class BatchItemResponse(BaseModel):
+    Name: str
+    success: bool = True
+    status: int = 200
+    message: Union[None, dict, list] = None
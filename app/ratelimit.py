@@ -0,0 +1,119 @@
+import asyncio
+import random
+import time
+from typing import Callable, Dict, Optional
+
+THROTTLING_CODES = {'ThrottlingException', 'TooManyRequestsException', 'RequestLimitExceeded'}
+RETRYABLE_CODES = THROTTLING_CODES | {'OperationTimeoutException', 'InternalServiceException'}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens/second. The rate adapts with AIMD:
+    halved on throttling (at most once per second) and raised by 1% of
+    max_rate on every success until max_rate is reached again.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, min_rate: float = 0.5):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.requests = 0
+        self.throttled = 0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self.tokens -= 1
+        self.requests += 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.01)
+
+    def on_throttle(self):
+        self.throttled += 1
+        now = time.monotonic()
+        if now - self._last_decrease >= 1.0:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._last_decrease = now
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+        }
+
+
+class RateLimiter:
+    """
+    One adaptive TokenBucket per Glue operation, created on first use by
+    bucket_factory(operation, rate), e.g. to share the buckets between workers.
+    """
+
+    def __init__(self, default_rate: float = 10.0, rates: Optional[Dict[str, float]] = None,
+                 bucket_factory: Optional[Callable[[str, float], TokenBucket]] = None):
+        self.default_rate = default_rate
+        self.rates = rates or {}
+        self.bucket_factory = bucket_factory or (lambda operation, rate: TokenBucket(rate))
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, operation: str) -> TokenBucket:
+        bucket = self.buckets.get(operation)
+        if bucket is None:
+            bucket = self.buckets[operation] = self.bucket_factory(operation,
+                                                                   self.rates.get(operation, self.default_rate))
+        return bucket
+
+    def stats(self) -> dict:
+        return {operation: bucket.stats() for operation, bucket in self.buckets.items()}
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for retryable Glue errors, limited by
+    max_attempts per call and by a shared retry budget: every success
+    deposits budget_ratio tokens, every retry withdraws one.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.1, max_delay: float = 5.0,
+                 budget: float = 10.0, budget_ratio: float = 0.1):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_capacity = budget
+        self.budget = budget
+        self.budget_ratio = budget_ratio
+        self.retries = 0
+        self.exhausted = 0
+
+    def should_retry(self, code: str, attempt: int) -> bool:
+        if code not in RETRYABLE_CODES:
+            return False
+        if attempt + 1 >= self.max_attempts or self.budget < 1:
+            self.exhausted += 1
+            return False
+        self.budget -= 1
+        self.retries += 1
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def on_success(self):
+        self.budget = min(self.budget_capacity, self.budget + self.budget_ratio)
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "budget": round(self.budget, 3),
+        }
@@ -0,0 +1,179 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from clients import use_region
+
+READY_GRACE_SECONDS = 60
+# A run is watched just after its start call returns; allow for that call and clock skew with Glue.
+START_SLACK_SECONDS = 5
+RETENTION_SECONDS = 3600
+
+
+class CrawlerRun:
+    """Tracked state of one crawler run, updated by the RunTracker poller."""
+
+    def __init__(self, name: str, started: bool, region: Optional[str] = None):
+        self.name = name
+        self.region = region
+        self.started = started
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.state: Optional[str] = None
+        self.last_crawl: Optional[dict] = None
+        self.error: Optional[dict] = None
+        self.seen_running = False
+        self.done = asyncio.Event()
+        self.subscribers: List[asyncio.Queue] = []
+
+    def update(self, crawler: Optional[dict]) -> bool:
+        """Apply a polled crawler definition; returns True if anything changed."""
+        if crawler is None:
+            self.error = {'Code': 'EntityNotFoundException',
+                          'Message': f'Crawler entry with name {self.name} does not exist'}
+            self.finish()
+            return True
+        state, last_crawl = crawler.get('State'), crawler.get('LastCrawl')
+        changed = state != self.state or last_crawl != self.last_crawl
+        self.state, self.last_crawl = state, last_crawl
+        if state in ('RUNNING', 'STOPPING'):
+            self.seen_running = True
+        elif state == 'READY' and (self.seen_running or not self.started or self.crawled_since_start(last_crawl)
+                                   or time.time() - self.started_at > READY_GRACE_SECONDS):
+            self.finish()
+            return True
+        if changed:
+            self.publish()
+        return changed
+
+    def crawled_since_start(self, last_crawl: Optional[dict]) -> bool:
+        """Whether the last crawl is this run, so a run that ended between two polls is not taken as pending."""
+        start_time = (last_crawl or {}).get('StartTime')
+        if isinstance(start_time, datetime):
+            start_time = start_time.timestamp()
+        return isinstance(start_time, (int, float)) and start_time >= self.started_at - START_SLACK_SECONDS
+
+    def finish(self):
+        self.finished_at = time.time()
+        self.done.set()
+        self.publish()
+
+    def publish(self):
+        snapshot = self.snapshot()
+        for queue in self.subscribers:
+            queue.put_nowait(snapshot)
+
+    def snapshot(self) -> dict:
+        return {
+            'Name': self.name,
+            'Region': self.region,
+            'State': self.state,
+            'Done': self.done.is_set(),
+            'StartedAt': self.started_at,
+            'FinishedAt': self.finished_at,
+            'LastCrawl': self.last_crawl,
+            'Error': self.error,
+        }
+
+
+class RunTracker:
+    """
+    Watches crawler runs with a single shared poller: every tick issues one
+    batched lookup for all unfinished runs. The interval starts at
+    min_interval, backs off towards max_interval while nothing changes and
+    resets whenever a state changes or a new run is watched.
+    Runs are keyed by region and name; each region's runs are looked up in
+    that region (None is the default region).
+    """
+
+    def __init__(self, fetch: Callable, min_interval: float = 5.0, max_interval: float = 30.0,
+                 on_crawler: Optional[Callable[[dict, Optional[str]], None]] = None):
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_crawler = on_crawler
+        self.runs: Dict[Tuple[Optional[str], str], CrawlerRun] = {}
+        self.closing = False
+        self._closed: Optional[asyncio.Event] = None
+        self._interval = min_interval
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(self, name: str, started: bool = False, region: Optional[str] = None) -> CrawlerRun:
+        """Track a crawler; started marks a run this service just kicked off."""
+        self._purge()
+        run = self.runs.get((region, name))
+        if run is None or run.done.is_set():
+            run = self.runs[(region, name)] = CrawlerRun(name, started, region)
+        self._interval = self.min_interval
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._poll())
+        else:
+            self._wakeup.set()
+        return run
+
+    def get(self, name: str, region: Optional[str] = None) -> Optional[CrawlerRun]:
+        return self.runs.get((region, name))
+
+    async def wait(self, run: CrawlerRun, timeout: float) -> bool:
+        """Wait up to timeout seconds, or until close(), for the run to finish; returns whether it did."""
+        if self._closed is None:
+            self._closed = asyncio.Event()
+        if not self.closing:
+            waits = [asyncio.ensure_future(run.done.wait()), asyncio.ensure_future(self._closed.wait())]
+            _, pending = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for future in pending:
+                future.cancel()
+        return run.done.is_set()
+
+    def close(self):
+        """Release every wait() and wake the runs' subscribers, e.g. while the server shuts down."""
+        self.closing = True
+        if self._closed is not None:
+            self._closed.set()
+        for run in self.runs.values():
+            run.publish()
+
+    def active(self) -> List[CrawlerRun]:
+        return [run for run in self.runs.values() if not run.done.is_set()]
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _poll(self):
+        while self.active():
+            self._wakeup.clear()
+            active: Dict[Optional[str], Dict[str, CrawlerRun]] = {}
+            for run in self.active():
+                active.setdefault(run.region, {})[run.name] = run
+            changed = False
+            results = await asyncio.gather(*(self._fetch(region, list(runs)) for region, runs in active.items()),
+                                           return_exceptions=True)
+            for (region, runs), result in zip(active.items(), results):
+                if isinstance(result, BaseException):
+                    continue
+                found, _ = result
+                for name, run in runs.items():
+                    crawler = found.get(name)
+                    if crawler is not None and self.on_crawler is not None:
+                        self.on_crawler(crawler, region)
+                    changed = run.update(crawler) or changed
+            self._interval = self.min_interval if changed else min(self._interval * 1.5, self.max_interval)
+            self._purge()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fetch(self, region: Optional[str], names: List[str]):
+        use_region(region)
+        return await self.fetch(names)
+
+    def _purge(self):
+        expired = time.time() - RETENTION_SECONDS
+        for key in [key for key, run in self.runs.items()
+                    if run.finished_at is not None and run.finished_at < expired]:
+            del self.runs[key]
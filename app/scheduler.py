@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+from clients import use_region
+
+LIMIT_CODES = {'ResourceNumberLimitExceededException', 'ConcurrentRunsExceededException'}
+MAX_RECORDED = 1000
+
+
+class StartQueue:
+    """
+    Starts queued crawlers while keeping at most max_running of them running.
+    A slot frees when the RunTracker reports the run complete and the next
+    queued crawler is started right away. Starts rejected by the account's
+    concurrency limit go back to the head of the queue and are retried after
+    retry_delay seconds. Entries are keyed by region and name, and each
+    crawler is started and tracked in its own region (None is the default region).
+    The queue lives in this process only; see shared.SharedStartQueue for more
+    than one worker or replica.
+    """
+
+    def __init__(self, start: Callable[[str], Awaitable], tracker, max_running: int = 25,
+                 retry_delay: float = 30.0):
+        self.start_crawler = start
+        self.tracker = tracker
+        self.max_running = max_running
+        self.retry_delay = retry_delay
+        self.running: Dict[Tuple[Optional[str], str], float] = {}
+        self.failures: Dict[Tuple[Optional[str], str], dict] = OrderedDict()
+        self.started = 0
+        self._queue: deque = deque()
+        self._queued: Dict[Tuple[Optional[str], str], float] = {}
+        self._wait_times: deque = deque(maxlen=MAX_RECORDED)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def enqueue(self, names: Iterable[str], region: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """Queue crawlers for starting; returns (queued, skipped as already queued or running)."""
+        queued, skipped = [], []
+        now = time.time()
+        for name in dict.fromkeys(names):
+            key = (region, name)
+            if key in self._queued or key in self.running:
+                skipped.append(name)
+                continue
+            self._queue.append(key)
+            self._queued[key] = now
+            self.failures.pop(key, None)
+            queued.append(name)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+        if queued and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._dispatch())
+        return queued, skipped
+
+    async def cancel(self, names: Iterable[str], region: Optional[str] = None) -> List[str]:
+        """Drop crawlers that are still waiting in the queue."""
+        cancelled = [name for name in names if self._queued.pop((region, name), None) is not None]
+        for name in cancelled:
+            self._queue.remove((region, name))
+        return cancelled
+
+    def queued(self, region: Optional[str] = None) -> List[str]:
+        return [name for key_region, name in self._queue if key_region == region]
+
+    def running_names(self, region: Optional[str] = None) -> List[str]:
+        return [name for key_region, name in self.running if key_region == region]
+
+    def failed(self, region: Optional[str] = None) -> Dict[str, dict]:
+        return {name: error for (key_region, name), error in self.failures.items() if key_region == region}
+
+    async def snapshot(self, region: Optional[str] = None) -> dict:
+        """Stats of the whole queue, and the queued, running and failed crawlers of one region."""
+        return {'Stats': self.stats(), 'Queued': self.queued(region), 'Running': self.running_names(region),
+                'Failures': self.failed(region)}
+
+    def start(self):
+        """Nothing to start up front: the dispatcher starts with the first enqueue."""
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def stats(self) -> dict:
+        now = time.time()
+        wait_times = list(self._wait_times)
+        return {
+            'max_running': self.max_running,
+            'running': len(self.running),
+            'queue_depth': len(self._queue),
+            'oldest_wait_seconds': now - min(self._queued.values()) if self._queued else 0.0,
+            'avg_wait_seconds': sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            'max_wait_seconds': max(wait_times) if wait_times else 0.0,
+            'started': self.started,
+            'failed': len(self.failures),
+        }
+
+    async def _dispatch(self):
+        while self._queue:
+            await self._slots.acquire()
+            if not self._queue:
+                self._slots.release()
+                break
+            key = self._queue.popleft()
+            enqueued_at = self._queued.pop(key)
+            region, name = key
+            use_region(region)
+            try:
+                await self.start_crawler(name)
+                started = True
+            except ClientError as error:
+                code = error.response['Error']['Code']
+                if code in LIMIT_CODES:
+                    self._queue.appendleft(key)
+                    self._queued[key] = enqueued_at
+                    self._slots.release()
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                if code != 'CrawlerRunningException':
+                    self._fail(key, error.response['Error'])
+                    continue
+                started = False
+            except Exception as e:
+                self._fail(key, {'message': 'Unhandled Exception'})
+                continue
+            if started:
+                self.started += 1
+            self._wait_times.append(time.time() - enqueued_at)
+            self.running[key] = time.time()
+            asyncio.ensure_future(self._release_when_done(key, self.tracker.watch(name, started=started,
+                                                                                  region=region)))
+
+    async def _release_when_done(self, key: Tuple[Optional[str], str], run):
+        try:
+            await run.done.wait()
+        finally:
+            self.running.pop(key, None)
+            self._slots.release()
+
+    def _fail(self, key: Tuple[Optional[str], str], error: dict):
+        self._slots.release()
+        self.failures[key] = error
+        while len(self.failures) > MAX_RECORDED:
+            self.failures.popitem(last=False)
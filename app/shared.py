@@ -0,0 +1,572 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Hashable, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from botocore.exceptions import ClientError
+from cache import TTLCache
+from clients import use_region
+from ratelimit import TokenBucket
+from scheduler import LIMIT_CODES, MAX_RECORDED
+
+INVALIDATION_CHANNEL = 'crawler-cache:invalidate'
+
+# Refills the bucket from Redis' clock, applies the AIMD feedback gathered
+# since the last call (successes raise the rate by 1% of max each, a
+# throttle halves it at most once per second) and reserves take tokens.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local max_rate, capacity, min_rate = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'rate', 'decreased')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local rate = tonumber(state[3]) or max_rate
+local decreased = tonumber(state[4]) or 0
+rate = math.min(max_rate, rate + max_rate * 0.01 * tonumber(ARGV[4]))
+if ARGV[5] == '1' and now - decreased >= 1 then
+    rate = math.max(min_rate, rate / 2)
+    decreased = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate) - tonumber(ARGV[6])
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now),
+           'rate', tostring(rate), 'decreased', tostring(decreased))
+redis.call('EXPIRE', KEYS[1], 3600)
+return {tostring(tokens), tostring(rate)}
+"""
+
+# Start queue entries are JSON [region, name] members. A list keeps their order and hashes
+# map them to when they were queued (KEYS[2]) and claimed for starting (KEYS[3]), so an
+# entry is never queued twice nor claimed past max_running by concurrent workers.
+ENQUEUE_SCRIPT = """
+local result = {}
+for i = 2, #ARGV do
+    local member = ARGV[i]
+    if redis.call('HEXISTS', KEYS[2], member) == 1 or redis.call('HEXISTS', KEYS[3], member) == 1 then
+        result[#result + 1] = 0
+    else
+        redis.call('RPUSH', KEYS[1], member)
+        redis.call('HSET', KEYS[2], member, ARGV[1])
+        redis.call('HDEL', KEYS[4], member)
+        result[#result + 1] = 1
+    end
+end
+return result
+"""
+
+CANCEL_SCRIPT = """
+local result = {}
+for i = 1, #ARGV do
+    if redis.call('HDEL', KEYS[2], ARGV[i]) == 1 then
+        redis.call('LREM', KEYS[1], 1, ARGV[i])
+        result[#result + 1] = 1
+    else
+        result[#result + 1] = 0
+    end
+end
+return result
+"""
+
+CLAIM_SCRIPT = """
+if redis.call('HLEN', KEYS[3]) >= tonumber(ARGV[1]) then
+    return false
+end
+local member = redis.call('LPOP', KEYS[1])
+if not member then
+    return false
+end
+local enqueued = redis.call('HGET', KEYS[2], member)
+redis.call('HDEL', KEYS[2], member)
+redis.call('HSET', KEYS[3], member, ARGV[2])
+return {member, enqueued}
+"""
+
+RENEW_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def connect(url: Optional[str]):
+    """
+    Redis client for the shared backend URL (redis://host:6379/0), or None to keep all state per process.
+    redis is imported here rather than at module level so processes without a shared backend never load it.
+    """
+    if not url:
+        return None
+    import redis.asyncio as redis
+    return redis.from_url(url, socket_timeout=1, socket_connect_timeout=1, health_check_interval=30)
+
+
+class TieredCache:
+    """
+    Per-process TTLCache in front of an optional cache in Redis shared by all
+    workers and replicas. get() only reads the local cache; fetch() falls back
+    to Redis on a local miss. Writes and invalidations apply locally at once and
+    reach Redis in order from a background task, which publishes invalidations
+    so the other workers drop their local copies. Redis errors degrade to the
+    local cache only. Keys whose first element is in indexed are also listed in
+    a Redis set per (kind, second element), so pop_prefix deletes them without
+    scanning the namespace.
+    """
+
+    def __init__(self, local: TTLCache, client=None, namespace: str = 'crawler-cache',
+                 indexed: Iterable[Hashable] = ()):
+        self.local = local
+        self.client = client
+        self.namespace = namespace
+        self.indexed = set(indexed)
+        self.shared_hits = 0
+        self.shared_errors = 0
+        self._origin = uuid.uuid4().hex
+        self._writes: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def ttl(self) -> float:
+        return self.local.ttl
+
+    def get(self, key: Hashable):
+        return self.local.get(key)
+
+    async def fetch(self, key: Hashable):
+        value = self.local.get(key)
+        if value is not None or self.client is None:
+            return value
+        try:
+            data = await self.client.get(self._name(key))
+        except Exception:
+            self.shared_errors += 1
+            return None
+        if data is None:
+            return None
+        value = orjson.loads(data)
+        self.local.set(key, value)
+        self.shared_hits += 1
+        return value
+
+    def set(self, key: Hashable, value):
+        self.local.set(key, value)
+        self._enqueue('set', key, value)
+
+    def pop(self, key: Hashable):
+        self.local.pop(key)
+        self._enqueue('delete', None, [key])
+
+    def pop_prefix(self, prefix: tuple):
+        """Drop every key starting with prefix, a (kind, second element) pair of an indexed kind."""
+        self._enqueue('delete', prefix, self.local.pop_matching(lambda key: key[:len(prefix)] == prefix))
+
+    def clear(self):
+        self.local.clear()
+
+    def stats(self) -> dict:
+        return dict(self.local.stats(), shared=self.client is not None,
+                    shared_hits=self.shared_hits, shared_errors=self.shared_errors)
+
+    def start(self):
+        if self.client is not None and not self._tasks:
+            self._writes = asyncio.Queue()
+            self._tasks = [asyncio.ensure_future(self._write()), asyncio.ensure_future(self._listen())]
+
+    async def stop(self, timeout: float = 1.0):
+        """Flush queued writes for up to timeout seconds, then stop the background tasks."""
+        if self._writes is not None:
+            try:
+                await asyncio.wait_for(self._writes.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _index(self, prefix: tuple) -> str:
+        return f'{self.namespace}-index:{orjson.dumps(list(prefix)).decode()}'
+
+    def _enqueue(self, operation: str, *args):
+        if self._writes is not None:
+            self._writes.put_nowait((operation, *args))
+
+    def _name(self, key: Hashable) -> str:
+        return f'{self.namespace}:{orjson.dumps(list(key)).decode()}'
+
+    def _key(self, name) -> tuple:
+        if isinstance(name, bytes):
+            name = name.decode()
+        return tuple(orjson.loads(name[len(self.namespace) + 1:]))
+
+    async def _write(self):
+        while True:
+            operation, key_or_prefix, value = await self._writes.get()
+            try:
+                if operation == 'set':
+                    ttl = int(self.local.ttl * 1000)
+                    async with self.client.pipeline(transaction=False) as pipe:
+                        pipe.set(self._name(key_or_prefix), orjson.dumps(value), px=ttl)
+                        if key_or_prefix[0] in self.indexed:
+                            index = self._index(key_or_prefix[:2])
+                            pipe.sadd(index, self._name(key_or_prefix))
+                            pipe.pexpire(index, ttl)
+                        await pipe.execute()
+                else:
+                    names = {self._name(key) for key in value}
+                    if key_or_prefix is not None:
+                        index = self._index(key_or_prefix)
+                        names.update(name.decode() for name in await self.client.smembers(index))
+                        await self.client.delete(index)
+                    if names:
+                        await self.client.delete(*names)
+                        await self.client.publish(INVALIDATION_CHANNEL,
+                                                  orjson.dumps({'origin': self._origin, 'names': sorted(names)}))
+            except Exception:
+                self.shared_errors += 1
+            finally:
+                self._writes.task_done()
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    payload = orjson.loads(message['data'])
+                    if payload['origin'] != self._origin:
+                        for name in payload['names']:
+                            self.local.pop(self._key(name))
+            except Exception:
+                self.shared_errors += 1
+                await asyncio.sleep(1)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose tokens and AIMD rate live in Redis, so every worker and
+    replica draws from one Glue rate budget. Success feedback is batched into
+    the next acquire. Falls back to the local bucket while Redis is unreachable.
+    """
+
+    def __init__(self, client, name: str, rate: float, burst: Optional[float] = None,
+                 min_rate: float = 0.5):
+        super().__init__(rate, burst, min_rate)
+        self.client = client
+        self.name = name
+        self._successes = 0
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self):
+        successes, self._successes = self._successes, 0
+        try:
+            tokens, rate = await self._update(successes=successes, take=1)
+        except Exception:
+            await super().acquire()
+            return
+        self.requests += 1
+        self.rate = rate
+        if tokens < 0:
+            await asyncio.sleep(-tokens / rate)
+
+    def on_success(self):
+        super().on_success()
+        self._successes += 1
+
+    def on_throttle(self):
+        super().on_throttle()
+        asyncio.ensure_future(self._report_throttle())
+
+    async def _report_throttle(self):
+        try:
+            await self._update(throttled=True)
+        except Exception:
+            pass
+
+    async def _update(self, successes: int = 0, throttled: bool = False, take: int = 0):
+        tokens, rate = await self._script(keys=[self.name], args=[self.max_rate, self.capacity, self.min_rate,
+                                                                  successes, int(throttled), take])
+        return float(tokens), float(rate)
+
+
+class SharedStore:
+    """
+    Idempotency record store in Redis, so a retry landing on another worker or
+    replica is replayed too. While Redis is unreachable requests simply execute.
+    """
+
+    def __init__(self, client, ttl: float = 3600.0, namespace: str = 'idempotency'):
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    async def get(self, key: str) -> Optional[dict]:
+        try:
+            data = await self.client.get(f'{self.namespace}:{key}')
+        except Exception:
+            return None
+        return orjson.loads(data) if data is not None else None
+
+    async def set(self, key: str, record: dict):
+        try:
+            await self.client.set(f'{self.namespace}:{key}', orjson.dumps(record), px=int(self.ttl * 1000))
+        except Exception:
+            pass
+
+
+class SharedStartQueue:
+    """
+    StartQueue whose queue, running set and failures live in Redis, so every
+    worker and replica sees one queue and max_running caps the whole fleet.
+    Any worker enqueues, cancels and lists entries; only the worker holding the
+    leader lease claims and starts them and tracks their runs. A new leader
+    adopts the running set, releasing entries whose crawler is no longer
+    running. stats() is refreshed in the background for the metrics collector.
+    """
+
+    def __init__(self, client, start: Callable[[str], Awaitable], tracker, max_running: int = 25,
+                 retry_delay: float = 30.0, lease: float = 10.0, poll_interval: float = 1.0,
+                 namespace: str = 'start-queue'):
+        self.client = client
+        self.start_crawler = start
+        self.tracker = tracker
+        self.max_running = max_running
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.namespace = namespace
+        self.leading = False
+        self.shared_errors = 0
+        self._token = uuid.uuid4().hex
+        self._stats = {'max_running': max_running, 'running': 0, 'queue_depth': 0, 'oldest_wait_seconds': 0.0,
+                       'avg_wait_seconds': 0.0, 'max_wait_seconds': 0.0, 'started': 0, 'failed': 0}
+        self._enqueue = client.register_script(ENQUEUE_SCRIPT)
+        self._cancel = client.register_script(CANCEL_SCRIPT)
+        self._claim = client.register_script(CLAIM_SCRIPT)
+        self._renew = client.register_script(RENEW_LEASE_SCRIPT)
+        self._release = client.register_script(RELEASE_LEASE_SCRIPT)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dispatch: Optional[asyncio.Task] = None
+        self._watchers: Set[asyncio.Task] = set()
+
+    async def enqueue(self, names: Iterable[str], region: Optional[str] = None) -> Tuple[List[str], List[str]]:
+        """Queue crawlers for starting; returns (queued, skipped as already queued or running)."""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return [], []
+        flags = await self._enqueue(keys=[self._key('queue'), self._key('queued'), self._key('running'),
+                                          self._key('failures')],
+                                    args=[time.time(), *(self._member(region, name) for name in names)])
+        await self._refresh()
+        self._wake()
+        return ([name for name, flag in zip(names, flags) if flag],
+                [name for name, flag in zip(names, flags) if not flag])
+
+    async def cancel(self, names: Iterable[str], region: Optional[str] = None) -> List[str]:
+        """Drop crawlers that are still waiting in the queue."""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+        flags = await self._cancel(keys=[self._key('queue'), self._key('queued')],
+                                   args=[self._member(region, name) for name in names])
+        return [name for name, flag in zip(names, flags) if flag]
+
+    async def snapshot(self, region: Optional[str] = None) -> dict:
+        """Stats of the whole queue, and the queued, running and failed crawlers of one region."""
+        await self._refresh()
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.lrange(self._key('queue'), 0, -1)
+            pipe.hkeys(self._key('running'))
+            pipe.hgetall(self._key('failures'))
+            queue, running, failures = await pipe.execute()
+        failed = {}
+        for member, error in failures.items():
+            entry_region, name = orjson.loads(member)
+            if entry_region == region:
+                failed[name] = orjson.loads(error)
+        return {'Stats': self.stats(), 'Queued': self._names(queue, region), 'Running': self._names(running, region),
+                'Failures': failed}
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    def start(self):
+        """Start competing for the leader lease; every worker runs this so the queue outlives any one of them."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._elect())
+
+    async def stop(self):
+        """Finish the start in progress, then hand the lease over; the next leader adopts the running entries."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        leading, self.leading = self.leading, False
+        if self._dispatch is not None:
+            self._wake()
+            try:
+                await asyncio.wait_for(self._dispatch, self.lease)
+            except asyncio.TimeoutError:
+                # The cancelled start may still reach Glue; let the lease expire before anyone adopts it.
+                leading = False
+            except Exception:
+                pass
+            self._dispatch = None
+        for task in self._watchers:
+            task.cancel()
+        self._watchers.clear()
+        if leading:
+            try:
+                await self._release(keys=[self._key('leader')], args=[self._token])
+            except Exception:
+                self.shared_errors += 1
+
+    def _key(self, name: str) -> str:
+        return f'{self.namespace}:{name}'
+
+    @staticmethod
+    def _member(region: Optional[str], name: str) -> str:
+        return orjson.dumps([region, name]).decode()
+
+    @staticmethod
+    def _names(members, region: Optional[str]) -> List[str]:
+        return [name for entry_region, name in map(orjson.loads, members) if entry_region == region]
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _refresh(self):
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.llen(self._key('queue'))
+            pipe.hlen(self._key('running'))
+            pipe.lindex(self._key('queue'), 0)
+            pipe.lrange(self._key('wait-times'), 0, -1)
+            pipe.hget(self._key('counters'), 'started')
+            pipe.hlen(self._key('failures'))
+            depth, running, head, wait_times, started, failed = await pipe.execute()
+        queued_at = await self.client.hget(self._key('queued'), head) if head is not None else None
+        wait_times = [float(wait) for wait in wait_times]
+        self._stats = {
+            'max_running': self.max_running,
+            'running': running,
+            'queue_depth': depth,
+            'oldest_wait_seconds': time.time() - float(queued_at) if queued_at is not None else 0.0,
+            'avg_wait_seconds': sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            'max_wait_seconds': max(wait_times) if wait_times else 0.0,
+            'started': int(started or 0),
+            'failed': failed,
+        }
+
+    async def _elect(self):
+        while True:
+            try:
+                if self.leading:
+                    self.leading = bool(await self._renew(keys=[self._key('leader')],
+                                                          args=[self._token, int(self.lease * 1000)]))
+                else:
+                    self.leading = bool(await self.client.set(self._key('leader'), self._token, nx=True,
+                                                              px=int(self.lease * 1000)))
+                await self._refresh()
+            except Exception:
+                # Without Redis the lease can't be confirmed, so stop starting crawlers.
+                self.leading = False
+                self.shared_errors += 1
+            # A deposed leader's dispatcher finishes the start in progress and then exits.
+            if self.leading and (self._dispatch is None or self._dispatch.done()):
+                self._dispatch = asyncio.ensure_future(self._lead())
+            await asyncio.sleep(self.lease / 3)
+
+    async def _lead(self):
+        try:
+            running = await self.client.hkeys(self._key('running'))
+        except Exception:
+            self.shared_errors += 1
+            return
+        for member in running:
+            self._watch(member, started=False)
+        while self.leading:
+            try:
+                claimed = await self._claim(keys=[self._key('queue'), self._key('queued'), self._key('running')],
+                                            args=[self.max_running, time.time()])
+            except Exception:
+                self.shared_errors += 1
+                claimed = None
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            member, enqueued_at = claimed
+            try:
+                await self._start_claimed(member, float(enqueued_at))
+            except Exception:
+                # Redis failed mid-way; free the slot once the crawler is no longer running.
+                self.shared_errors += 1
+                self._watch(member, started=False)
+
+    async def _start_claimed(self, member, enqueued_at: float):
+        region, name = orjson.loads(member)
+        use_region(region)
+        try:
+            await self.start_crawler(name)
+            started = True
+        except ClientError as error:
+            code = error.response['Error']['Code']
+            if code in LIMIT_CODES:
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.lpush(self._key('queue'), member)
+                    pipe.hset(self._key('queued'), member, enqueued_at)
+                    pipe.hdel(self._key('running'), member)
+                    await pipe.execute()
+                await asyncio.sleep(self.retry_delay)
+                return
+            if code != 'CrawlerRunningException':
+                await self._fail(member, error.response['Error'])
+                return
+            started = False
+        except Exception as e:
+            await self._fail(member, {'message': 'Unhandled Exception'})
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            if started:
+                pipe.hincrby(self._key('counters'), 'started', 1)
+            pipe.lpush(self._key('wait-times'), time.time() - enqueued_at)
+            pipe.ltrim(self._key('wait-times'), 0, MAX_RECORDED - 1)
+            await pipe.execute()
+        self._watch(member, started=started)
+
+    def _watch(self, member, started: bool):
+        region, name = orjson.loads(member)
+        task = asyncio.ensure_future(self._release_when_done(member, self.tracker.watch(name, started=started,
+                                                                                         region=region)))
+        self._watchers.add(task)
+        task.add_done_callback(self._watchers.discard)
+
+    async def _release_when_done(self, member, run):
+        await run.done.wait()
+        while True:
+            try:
+                await self.client.hdel(self._key('running'), member)
+                break
+            except Exception:
+                self.shared_errors += 1
+                await asyncio.sleep(1)
+        self._wake()
+
+    async def _fail(self, member, error: dict):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hdel(self._key('running'), member)
+            pipe.hset(self._key('failures'), member, orjson.dumps(error))
+            pipe.expire(self._key('failures'), 86400)
+            await pipe.execute()
+        self._wake()
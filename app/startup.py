@@ -0,0 +1,40 @@
+import os
+import time
+from typing import Dict, Optional
+
+from metrics import STARTUP_SECONDS
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process was created (a gunicorn worker: since its fork), from /proc; None off Linux."""
+    try:
+        with open('/proc/self/stat') as stat, open('/proc/uptime') as uptime:
+            # The command name in field 2 may contain spaces, so count fields after its closing parenthesis.
+            started_ticks = int(stat.read().rsplit(')', 1)[1].split()[19])
+            return float(uptime.read().split()[0]) - started_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimes:
+    """
+    Seconds from process start to each startup phase of this worker, e.g.
+    imported, serving and glue_warm_up, also exported as the
+    crawler_startup_seconds gauge. Where the process start is unknown the
+    clock starts when this object is created, i.e. early in the app import.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic() - (process_age() or 0.0)
+        self.phases: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def mark(self, phase: str):
+        self.phases[phase] = round(time.monotonic() - self.origin, 4)
+        STARTUP_SECONDS.labels(phase).set(self.phases[phase])
+
+    def fail(self, phase: str, error: Exception):
+        self.errors[phase] = f'{type(error).__name__}: {error}'
+
+    def stats(self) -> dict:
+        return {'phases': dict(self.phases), 'errors': dict(self.errors)}
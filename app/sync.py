@@ -0,0 +1,51 @@
+from typing import Dict, Iterable, List, Optional
+
+
+def matches(desired, current) -> bool:
+    """
+    Whether the current Glue value satisfies the desired one. Dict keys that
+    are only present in current are ignored unless they hold a non-empty
+    list or dict, e.g. an extra target type on the crawler.
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        extra = [value for key, value in current.items() if key not in desired]
+        return (all(matches(value, current.get(key)) for key, value in desired.items())
+                and not any(isinstance(value, (list, dict)) and value for value in extra))
+    if isinstance(desired, list):
+        return (isinstance(current, list) and len(desired) == len(current)
+                and all(matches(d, c) for d, c in zip(desired, current)))
+    return desired == current
+
+
+def role_name(role: Optional[str]) -> Optional[str]:
+    """The IAM role name of an ARN or a name; Glue returns the name even for a crawler created with the ARN."""
+    return role.partition(':role/')[2] or role if role else role
+
+
+def changed_fields(params: dict, crawler: dict) -> List[str]:
+    current = dict(crawler, Role=role_name(crawler.get('Role')))
+    desired = dict(params, Role=role_name(params.get('Role')))
+    return [key for key, value in desired.items() if key != 'Name' and not matches(value, current.get(key))]
+
+
+def plan_sync(desired: list, current: Dict[str, dict], managed: Optional[Iterable[str]] = None) -> dict:
+    """
+    Diff the desired crawler specs against the current crawler definitions.
+    Names in managed that are not desired are planned for deletion.
+    """
+    plan = {'Create': [], 'Update': [], 'Delete': [], 'Unchanged': []}
+    for glue in desired:
+        crawler = current.get(glue.Name)
+        if crawler is None:
+            plan['Create'].append(glue.Name)
+            continue
+        fields = changed_fields(glue.crawler_params(), crawler)
+        if fields:
+            plan['Update'].append({'Name': glue.Name, 'Fields': fields})
+        else:
+            plan['Unchanged'].append(glue.Name)
+    desired_names = {glue.Name for glue in desired}
+    plan['Delete'] = [name for name in managed or [] if name not in desired_names]
+    return plan
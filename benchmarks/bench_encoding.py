@@ -0,0 +1,74 @@
+"""
+Compare the old and new encoding of a large get_crawlers response.
+
+before: the raw boto3 response wrapped in SuccessResponse, run through
+        jsonable_encoder and rendered by JSONResponse (FastAPI's default path).
+after:  the ResponseMetadata-free payload rendered directly by ORJSONResponse,
+        optionally projected to a few fields.
+
+Usage: python benchmarks/bench_encoding.py [crawler_count] [repeat]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from model import SuccessResponse  # noqa: E402
+
+
+def fake_crawler(i: int) -> dict:
+    now = datetime(2023, 3, 1, 12, 0, tzinfo=timezone.utc)
+    return {
+        'Name': f'crawler-{i:05d}',
+        'Role': 'arn:aws:iam::123456789012:role/glue-crawler',
+        'Targets': {'S3Targets': [{'Path': f's3://datalake/raw/table_{i}/', 'Exclusions': []}],
+                    'JdbcTargets': [], 'MongoDBTargets': [], 'DynamoDBTargets': [],
+                    'CatalogTargets': [], 'DeltaTargets': []},
+        'DatabaseName': 'raw',
+        'Classifiers': [],
+        'RecrawlPolicy': {'RecrawlBehavior': 'CRAWL_EVERYTHING'},
+        'SchemaChangePolicy': {'UpdateBehavior': 'UPDATE_IN_DATABASE', 'DeleteBehavior': 'DEPRECATE_IN_DATABASE'},
+        'LineageConfiguration': {'CrawlerLineageSettings': 'DISABLE'},
+        'State': 'READY',
+        'CrawlElapsedTime': 0,
+        'CreationTime': now,
+        'LastUpdated': now,
+        'LastCrawl': {'Status': 'SUCCEEDED', 'LogGroup': '/aws-glue/crawlers',
+                      'LogStream': f'crawler-{i:05d}', 'MessagePrefix': 'a1b2c3', 'StartTime': now},
+        'Version': 3,
+        'LakeFormationConfiguration': {'UseLakeFormationCredentials': False, 'AccountId': ''},
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    crawlers = [fake_crawler(i) for i in range(count)]
+    raw = {'Crawlers': crawlers, 'ResponseMetadata': {
+        'RequestId': '0f1e2d3c', 'HTTPStatusCode': 200, 'RetryAttempts': 0,
+        'HTTPHeaders': {'date': 'Wed, 01 Mar 2023 12:00:00 GMT', 'content-type': 'application/x-amz-json-1.1',
+                        'content-length': '123456', 'connection': 'keep-alive', 'x-amzn-requestid': '0f1e2d3c'}}}
+    fields = ['Name', 'State', 'LastCrawl']
+
+    def before():
+        return JSONResponse(jsonable_encoder(SuccessResponse(status=200, data=raw))).body
+
+    def after():
+        return ORJSONResponse({'success': True, 'status': 200, 'data': {'Crawlers': crawlers, 'NextToken': None}}).body
+
+    def after_projected():
+        projected = [{key: crawler[key] for key in fields if key in crawler} for crawler in crawlers]
+        return ORJSONResponse({'success': True, 'status': 200, 'data': {'Crawlers': projected, 'NextToken': None}}).body
+
+    print(f'{count} crawlers, best of {repeat} runs')
+    for name, fn in (('before', before), ('after', after), (f'after fields={",".join(fields)}', after_projected)):
+        seconds = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f'{name:<36} {seconds * 1000:8.2f} ms  {len(fn()) / 1024:9.1f} KiB')
+
+
+if __name__ == '__main__':
+    main()
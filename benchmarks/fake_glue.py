@@ -0,0 +1,294 @@
+"""
+In-memory stand-in for the AWS Glue crawler API, speaking the awsJson1.1
+protocol boto3 uses, so the app can be driven end to end without AWS.
+
+Latency, throttling and errors can be injected:
+    latency_ms / jitter_ms  added to every call
+    throttle_rate           fraction of calls answered with ThrottlingException
+    error_rate              fraction of calls answered with InternalServiceException
+    max_rps                 calls above this rate are throttled, like Glue's own limits
+
+Started crawlers stay RUNNING for run_seconds and then finish SUCCEEDED.
+
+Usage: python benchmarks/fake_glue.py [--port 8555] [--crawlers 2000] [--latency-ms 20] ...
+Then set glue_endpoint_url=http://127.0.0.1:8555 in the app's .env.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class GlueError(Exception):
+    def __init__(self, code: str, message: str, status: int = 400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+
+
+class FakeGlue:
+    """Crawler state and operation handlers of the stand-in, keyed by Glue operation name."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, throttle_rate: float = 0,
+                 error_rate: float = 0, max_rps: Optional[float] = None, run_seconds: float = 60):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.run_seconds = run_seconds
+        self.crawlers = {}
+        self.tags = {}
+        self.crawls = {}
+        self.calls = Counter()
+        self.faults = Counter()
+        self._tokens = max_rps or 0
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def seed(self, count: int, prefix: str = 'bench-crawler-', history: int = 10):
+        """Create count crawlers, each with history past runs of varied length and outcome."""
+        now = time.time()
+        for i in range(count):
+            self.crawls[f'{prefix}{i:05d}'] = [
+                {'CrawlId': f'{i:05d}{run:04d}', 'State': 'FAILED' if run % 7 == 6 else 'COMPLETED',
+                 'StartTime': now - 86400 * (run + 1), 'EndTime': now - 86400 * (run + 1) + 60 + (i % 50) * 30 + run * 5,
+                 'DPUHour': round((60 + (i % 50) * 30 + run * 5) / 3600 * 2, 4),
+                 'Summary': json.dumps({'TABLE': {'ADD': {'Count': run % 3}, 'UPDATE': {'Count': i % 4}}})}
+                for run in range(history)]
+            self.CreateCrawler({'Name': f'{prefix}{i:05d}', 'Role': 'arn:aws:iam::123456789012:role/glue-crawler',
+                                'DatabaseName': f'db_{i % 20}',
+                                'Targets': {'S3Targets': [{'Path': f's3://datalake/raw/table_{i}/'}]}})
+            self.tags[f'{prefix}{i:05d}'] = {'team': f'team-{i % 5}'}
+
+    def handle(self, operation: str, params: dict) -> dict:
+        """Run one call with the configured faults injected, raising GlueError for error responses."""
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        with self._lock:
+            self.calls[operation] += 1
+            if self._throttled() or random.random() < self.throttle_rate:
+                self.faults['ThrottlingException'] += 1
+                raise GlueError('ThrottlingException', 'Rate exceeded')
+            if random.random() < self.error_rate:
+                self.faults['InternalServiceException'] += 1
+                raise GlueError('InternalServiceException', 'Injected failure', status=500)
+            handler = getattr(self, operation, None)
+            if handler is None:
+                raise GlueError('UnknownOperationException', f'Unsupported operation {operation}')
+            return handler(params)
+
+    def _throttled(self) -> bool:
+        if not self.max_rps:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.max_rps, self._tokens + (now - self._refilled) * self.max_rps)
+        self._refilled = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def _crawler(self, name: str) -> dict:
+        crawler = self.crawlers.get(name)
+        if crawler is None:
+            raise GlueError('EntityNotFoundException', f'Crawler entry with name {name} does not exist')
+        if crawler['State'] == 'RUNNING' and time.time() - crawler['_started'] >= self.run_seconds:
+            self._finish(crawler, 'SUCCEEDED')
+        return crawler
+
+    def _finish(self, crawler: dict, status: str):
+        started = crawler.pop('_started')
+        crawler['State'] = 'READY'
+        crawler['CrawlElapsedTime'] = 0
+        crawler['LastCrawl'] = {'Status': status, 'StartTime': started,
+                                'LogGroup': '/aws-glue/crawlers', 'LogStream': crawler['Name']}
+        self.crawls.setdefault(crawler['Name'], []).insert(0, {
+            'CrawlId': f'{random.getrandbits(64):016x}', 'State': 'COMPLETED' if status == 'SUCCEEDED' else 'STOPPED',
+            'StartTime': started, 'EndTime': time.time(), 'DPUHour': round((time.time() - started) / 3600, 4),
+            'Summary': json.dumps({'TABLE': {'ADD': {'Count': random.randint(0, 3)},
+                                             'UPDATE': {'Count': random.randint(0, 5)}}})})
+
+    @staticmethod
+    def _role_name(role: str) -> str:
+        # Like Glue, keep the role name of a role ARN.
+        return role.partition(':role/')[2] or role
+
+    @staticmethod
+    def _public(crawler: dict) -> dict:
+        return {key: value for key, value in crawler.items() if not key.startswith('_')}
+
+    @staticmethod
+    def _page(items: list, params: dict, default_size: int = 100):
+        start = int(params.get('NextToken') or 0)
+        end = start + int(params.get('MaxResults') or default_size)
+        return items[start:end], (str(end) if end < len(items) else None)
+
+    def CreateCrawler(self, params: dict) -> dict:
+        if params['Name'] in self.crawlers:
+            raise GlueError('AlreadyExistsException', f"{params['Name']} already exists")
+        now = time.time()
+        self.crawlers[params['Name']] = dict(params, Role=self._role_name(params['Role']), State='READY',
+                                             CrawlElapsedTime=0, Version=1, CreationTime=now, LastUpdated=now)
+        self.tags[params['Name']] = params.get('Tags') or {}
+        return {}
+
+    def UpdateCrawler(self, params: dict) -> dict:
+        crawler = self._crawler(params['Name'])
+        if crawler['State'] != 'READY':
+            raise GlueError('CrawlerRunningException', f"Crawler with name {params['Name']} has already started")
+        crawler.update(params, Version=crawler['Version'] + 1, LastUpdated=time.time())
+        if 'Role' in params:
+            crawler['Role'] = self._role_name(params['Role'])
+        return {}
+
+    def DeleteCrawler(self, params: dict) -> dict:
+        self._crawler(params['Name'])
+        del self.crawlers[params['Name']]
+        self.tags.pop(params['Name'], None)
+        return {}
+
+    def GetCrawler(self, params: dict) -> dict:
+        return {'Crawler': self._public(self._crawler(params['Name']))}
+
+    def GetCrawlers(self, params: dict) -> dict:
+        names, next_token = self._page(list(self.crawlers), params)
+        response = {'Crawlers': [self._public(self._crawler(name)) for name in names]}
+        if next_token:
+            response['NextToken'] = next_token
+        return response
+
+    def ListCrawlers(self, params: dict) -> dict:
+        names = [name for name in self.crawlers
+                 if all(self.tags.get(name, {}).get(key) == value for key, value in (params.get('Tags') or {}).items())]
+        names, next_token = self._page(names, params)
+        response = {'CrawlerNames': names}
+        if next_token:
+            response['NextToken'] = next_token
+        return response
+
+    def BatchGetCrawlers(self, params: dict) -> dict:
+        found = [name for name in params['CrawlerNames'] if name in self.crawlers]
+        return {'Crawlers': [self._public(self._crawler(name)) for name in found],
+                'CrawlersNotFound': [name for name in params['CrawlerNames'] if name not in self.crawlers]}
+
+    def StartCrawler(self, params: dict) -> dict:
+        crawler = self._crawler(params['Name'])
+        if crawler['State'] != 'READY':
+            raise GlueError('CrawlerRunningException', f"Crawler with name {params['Name']} has already started")
+        crawler['State'] = 'RUNNING'
+        crawler['_started'] = time.time()
+        return {}
+
+    def StopCrawler(self, params: dict) -> dict:
+        crawler = self._crawler(params['Name'])
+        if crawler['State'] != 'RUNNING':
+            raise GlueError('CrawlerNotRunningException', f"Crawler with name {params['Name']} isn't running")
+        self._finish(crawler, 'CANCELLED')
+        return {}
+
+    def ListCrawls(self, params: dict) -> dict:
+        self._crawler(params['CrawlerName'])
+        crawls, next_token = self._page(self.crawls.get(params['CrawlerName'], []), params)
+        response = {'Crawls': crawls}
+        if next_token:
+            response['NextToken'] = next_token
+        return response
+
+    def GetCrawlerMetrics(self, params: dict) -> dict:
+        names = params.get('CrawlerNameList') or list(self.crawlers)
+        names, next_token = self._page([name for name in names if name in self.crawlers], params)
+        metrics = []
+        for name in names:
+            runtimes = sorted(crawl['EndTime'] - crawl['StartTime'] for crawl in self.crawls.get(name, []))
+            metrics.append({'CrawlerName': name, 'StillEstimating': False,
+                            'LastRuntimeSeconds': runtimes[-1] if runtimes else 0,
+                            'MedianRuntimeSeconds': runtimes[len(runtimes) // 2] if runtimes else 0,
+                            'TablesCreated': 0, 'TablesUpdated': 0, 'TablesDeleted': 0})
+        response = {'CrawlerMetricsList': metrics}
+        if next_token:
+            response['NextToken'] = next_token
+        return response
+
+    def GetTags(self, params: dict) -> dict:
+        return {'Tags': self.tags.get(params['ResourceArn'].rsplit('/', 1)[-1], {})}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'calls': dict(self.calls), 'faults': dict(self.faults)}
+
+
+def make_handler(glue: FakeGlue):
+    class GlueRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; with Nagle on, the body waits for the
+        # client's delayed ACK (~40 ms) and swamps the injected latency.
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            operation = (self.headers.get('X-Amz-Target') or '').rsplit('.', 1)[-1]
+            try:
+                status, payload = 200, glue.handle(operation, json.loads(body or b'{}'))
+            except GlueError as error:
+                status, payload = error.status, {'__type': error.code, 'Message': error.message}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/x-amz-json-1.1')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('x-amzn-RequestId', f'{random.getrandbits(64):016x}')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return GlueRequestHandler
+
+
+def serve(glue: FakeGlue, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Serve glue on a background thread; port 0 picks a free port (see server.server_port)."""
+    server = ThreadingHTTPServer((host, port), make_handler(glue))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--crawlers', type=int, default=2000, help='crawlers to seed')
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=5)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--max-rps', type=float, default=None, help='throttle calls above this rate')
+    parser.add_argument('--run-seconds', type=float, default=600, help='how long started crawlers run')
+
+
+def from_arguments(args) -> FakeGlue:
+    glue = FakeGlue(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, throttle_rate=args.throttle_rate,
+                    error_rate=args.error_rate, max_rps=args.max_rps, run_seconds=args.run_seconds)
+    glue.seed(args.crawlers)
+    return glue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8555)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    server = serve(from_arguments(args), port=args.port)
+    print(f'fake Glue listening on http://127.0.0.1:{server.server_port}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Load test every crawler route of the app against the fake Glue backend.
+
+The app runs under uvicorn in a subprocess with a generated .env pointing at
+an in-process FakeGlue (see fake_glue.py for the fault injection options).
+Each scenario sends --requests requests at each --concurrency level and
+reports throughput, latency percentiles, error rate, the Glue calls it cost
+and the server's resident memory.
+
+Needs httpx and uvicorn (pip install httpx uvicorn); --workers > 1 serves the
+app with gunicorn and app/gunicorn_conf.py instead, which also needs
+--env shared_backend_url=redis://... so the workers share one backend.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 1,16,64 --requests 500
+    python benchmarks/load_test.py --routes get_crawler,get_crawlers --throttle-rate 0.05 --json results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from fake_glue import add_fault_arguments, from_arguments, serve
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app')
+SEEDED = 'bench-crawler-{:05d}'
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    path: Callable[[int], str]
+    body: Optional[Callable[[int], dict]] = None
+
+
+def seeded(i: int) -> str:
+    return SEEDED.format(i)
+
+
+def crawler_body(i: int, prefix: str, **targets) -> dict:
+    return dict({'Name': f'{prefix}-{i:06d}', 'Role': 'arn:aws:iam::123456789012:role/glue-crawler',
+                 'DatabaseName': f'db_{i % 20}'}, **targets)
+
+
+def scenarios(seed_count: int, run: str) -> List[Scenario]:
+    """Every route, in an order where each scenario leaves the state the next one needs."""
+    def pick(i: int) -> str:
+        return seeded(i % seed_count)
+
+    return [
+        Scenario('create_s3_crawler', 'POST', lambda i: '/crawler/create_s3_crawler',
+                 lambda i: crawler_body(i, f'{run}-s3', S3Path=f's3://datalake/new/{i}/')),
+        Scenario('create_jdbc_crawler', 'POST', lambda i: '/crawler/create_jdbc_crawler',
+                 lambda i: crawler_body(i, f'{run}-jdbc', ConnectionName='warehouse', Path=f'db/schema/t{i}')),
+        Scenario('create_catalog_crawler', 'POST', lambda i: '/crawler/create_catalog_crawler',
+                 lambda i: crawler_body(i, f'{run}-catalog', Tables=[f't{i}'])),
+        Scenario('create_delta_crawler', 'POST', lambda i: '/crawler/create_delta_crawler',
+                 lambda i: crawler_body(i, f'{run}-delta', DeltaTables=[f's3://datalake/delta/{i}/'])),
+        Scenario('create_crawler', 'POST', lambda i: '/crawler/create_crawler',
+                 lambda i: crawler_body(i, f'{run}-mixed', S3Targets=[{'Path': f's3://datalake/mixed/{i}/'}])),
+        Scenario('update_s3_crawler', 'PUT', lambda i: '/crawler/update_s3_crawler',
+                 lambda i: dict(crawler_body(0, ''), Name=pick(i), S3Path=f's3://datalake/raw/table_{i}/')),
+        Scenario('update_jdbc_crawler', 'PUT', lambda i: '/crawler/update_jdbc_crawler',
+                 lambda i: dict(crawler_body(0, ''), Name=pick(i), ConnectionName='warehouse', Path='db/schema/t')),
+        Scenario('update_catalog_crawler', 'PUT', lambda i: '/crawler/update_catalog_crawler',
+                 lambda i: dict(crawler_body(0, ''), Name=pick(i), Tables=['t'])),
+        Scenario('update_delta_crawler', 'PUT', lambda i: '/crawler/update_delta_crawler',
+                 lambda i: dict(crawler_body(0, ''), Name=pick(i), DeltaTables=['s3://datalake/delta/t/'])),
+        Scenario('update_crawler', 'PUT', lambda i: '/crawler/update_crawler',
+                 lambda i: dict(crawler_body(0, ''), Name=pick(i), S3Targets=[{'Path': f's3://datalake/raw/table_{i}/'}])),
+        Scenario('get_crawler', 'GET', lambda i: f'/crawler/get_crawler/{pick(i)}'),
+        Scenario('get_crawler_fresh', 'GET', lambda i: f'/crawler/get_crawler/{pick(i)}?fresh=true'),
+        Scenario('batch_get', 'POST', lambda i: '/crawler/batch_get?fields=Name,State',
+                 lambda i: {'CrawlerNames': [pick(i * 50 + j) for j in range(50)]}),
+        Scenario('get_crawlers', 'GET', lambda i: '/crawler/get_crawlers'),
+        Scenario('get_crawlers_fresh', 'GET', lambda i: '/crawler/get_crawlers?fresh=true&fields=Name,State'),
+        Scenario('get_crawlers_page', 'GET', lambda i: '/crawler/get_crawlers?limit=100&fresh=true'),
+        Scenario('list_crawlers', 'GET', lambda i: '/crawler/list_crawlers'),
+        Scenario('list_crawlers_fresh', 'GET', lambda i: '/crawler/list_crawlers?fresh=true'),
+        Scenario('search', 'GET', lambda i: f'/crawler/search?path_prefix=s3://datalake/raw/table_{i % 100}&fields=Name'),
+        Scenario('history', 'GET', lambda i: f'/crawler/{pick(i)}/history?limit=20'),
+        Scenario('stats', 'GET', lambda i: '/crawler/stats?top=20'),
+        Scenario('stats_prefix', 'GET', lambda i: f'/crawler/stats?prefix={seeded(i % seed_count)[:-2]}&days=7&fresh=true'),
+        Scenario('start_crawler', 'GET', lambda i: f'/crawler/start_crawler/{pick(i)}'),
+        Scenario('get_run', 'GET', lambda i: f'/crawler/runs/{pick(i)}'),
+        Scenario('stop_crawler', 'GET', lambda i: f'/crawler/stop_crawler/{pick(i)}'),
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def memory_kib(pid: int) -> dict:
+    """
+    Current and peak resident set size of pid plus its child processes (gunicorn
+    workers), from /proc (Linux only).
+    """
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            pids = [pid] + [int(child) for child in children.read().split()]
+        rss = peak = 0
+        for process in pids:
+            with open(f'/proc/{process}/status') as status:
+                fields = dict(line.split(':', 1) for line in status if ':' in line)
+            rss += int(fields['VmRSS'].split()[0])
+            peak += int(fields['VmHWM'].split()[0])
+        return {'rss_kib': rss, 'peak_rss_kib': peak}
+    except (OSError, KeyError, ValueError):
+        return {'rss_kib': None, 'peak_rss_kib': None}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def succeeded(response: httpx.Response) -> bool:
+    """False for an app-level error body; a non-JSON body (e.g. a proxy's 502 page) counts as an error too."""
+    try:
+        return response.json().get('success') is not False
+    except ValueError:
+        return False
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, offset: int) -> dict:
+    latencies, errors, counter = [], 0, itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            body = scenario.body(offset + i) if scenario.body else None
+            start = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path(offset + i), json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400 or not succeeded(response):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {'requests': requests, 'seconds': elapsed, 'rps': requests / elapsed, 'errors': errors,
+            'p50_ms': percentile(latencies, 0.50) * 1000, 'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000, 'max_ms': latencies[-1] * 1000}
+
+
+def start_app(glue_url: str, args) -> Tuple[subprocess.Popen, str]:
+    workdir = tempfile.mkdtemp(prefix='glue-bench-')
+    with open(os.path.join(workdir, '.env'), 'w') as env:
+        env.write('\n'.join([
+            'aws_access_key_id=bench', 'aws_secret_access_key=bench', 'aws_region=us-east-1',
+            f'glue_endpoint_url={glue_url}',
+            f'glue_rate_limit={args.glue_rate_limit}',
+            f'glue_max_concurrency={args.glue_max_concurrency}',
+            f'glue_max_attempts={args.glue_max_attempts}',
+            f'web_concurrency={args.workers}',
+        ] + args.env) + '\n')
+    port = free_port()
+    if args.workers > 1:
+        command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(os.path.abspath(APP_DIR), 'gunicorn_conf.py'),
+                   '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+                   '--access-logfile', os.devnull, '--pythonpath', os.path.abspath(APP_DIR), 'main:app']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port),
+                   '--log-level', 'warning', '--app-dir', os.path.abspath(APP_DIR)]
+    process = subprocess.Popen(command, cwd=workdir)
+    return process, f'http://127.0.0.1:{port}'
+
+
+async def wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError('app exited during startup')
+            try:
+                await client.get('/crawler/cache/stats')
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f'app not reachable at {base_url}')
+
+
+async def run(args) -> List[dict]:
+    glue = from_arguments(args)
+    server = serve(glue)
+    process, base_url = start_app(f'http://127.0.0.1:{server.server_port}', args)
+    results = []
+    try:
+        await wait_until_up(base_url, process)
+        selected = [scenario for scenario in scenarios(args.crawlers, f'run{int(time.time())}')
+                    if not args.routes or scenario.name in args.routes]
+        limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            print(f"{'scenario':<24}{'conc':>5}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+                  f"{'errors':>8}{'glue calls':>11}{'rss MiB':>9}")
+            for concurrency in args.concurrency:
+                for scenario in selected:
+                    calls_before = sum(glue.stats()['calls'].values())
+                    result = await drive(client, scenario, args.requests, concurrency,
+                                         offset=concurrency * args.requests)
+                    result.update(scenario=scenario.name, concurrency=concurrency,
+                                  glue_calls=sum(glue.stats()['calls'].values()) - calls_before,
+                                  **memory_kib(process.pid))
+                    results.append(result)
+                    rss = f"{result['rss_kib'] / 1024:.1f}" if result['rss_kib'] else 'n/a'
+                    print(f"{scenario.name:<24}{concurrency:>5}{result['rps']:>9.1f}{result['p50_ms']:>9.1f}"
+                          f"{result['p95_ms']:>9.1f}{result['p99_ms']:>9.1f}{result['errors']:>8}"
+                          f"{result['glue_calls']:>11}{rss:>9}")
+        print(f"fake Glue: {glue.stats()}")
+    finally:
+        process.terminate()
+        process.wait(10)
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=lambda value: [int(c) for c in value.split(',')], default=[1, 16, 64])
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario and concurrency level')
+    parser.add_argument('--routes', type=lambda value: value.split(','), default=None,
+                        help='comma-separated scenario names, default all')
+    parser.add_argument('--timeout', type=float, default=60, help='client timeout per request in seconds')
+    parser.add_argument('--glue-rate-limit', type=float, default=10000, help="app's glue_rate_limit")
+    parser.add_argument('--glue-max-concurrency', type=int, default=32, help="app's glue_max_concurrency")
+    parser.add_argument('--workers', type=int, default=1, help='serve with gunicorn and this many workers')
+    parser.add_argument('--glue-max-attempts', type=int, default=5, help="app's glue_max_attempts")
+    parser.add_argument('--env', action='append', default=[], help='extra key=value line for the app .env')
+    parser.add_argument('--json', help='write the results to this file')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({'arguments': vars(args), 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
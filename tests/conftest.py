@@ -0,0 +1,69 @@
+import asyncio
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'app'), os.path.join(ROOT, 'benchmarks')]
+
+from clients import GlueClients  # noqa: E402
+from executor import GlueExecutor  # noqa: E402
+from fake_glue import FakeGlue, serve  # noqa: E402
+from ratelimit import RateLimiter, RetryPolicy  # noqa: E402
+
+
+def run(coroutine):
+    """Run a coroutine to completion on a fresh event loop."""
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def glue():
+    """A seeded FakeGlue served on a free local port; glue.url is its endpoint."""
+    fake = FakeGlue(run_seconds=0.3)
+    fake.seed(20)
+    server = serve(fake)
+    fake.url = f'http://127.0.0.1:{server.server_port}'
+    yield fake
+    server.shutdown()
+
+
+def glue_executor(url: str, rate: float = 1000, max_attempts: int = 5) -> GlueExecutor:
+    clients = GlueClients(access_key_id='test', secret_access_key='test', default_region='us-east-1',
+                          endpoint_url=url)
+    return GlueExecutor(clients, max_concurrency=8, limiter=RateLimiter(default_rate=rate),
+                        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0.01))
+
+
+@pytest.fixture
+def executor(glue):
+    executor = glue_executor(glue.url)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture(scope='session')
+def app_glue():
+    """FakeGlue behind the app module; shared by the whole session since main is imported once."""
+    fake = FakeGlue(run_seconds=0.3)
+    fake.seed(20)
+    server = serve(fake)
+    fake.url = f'http://127.0.0.1:{server.server_port}'
+    yield fake
+    server.shutdown()
+
+
+@pytest.fixture(scope='session')
+def main(app_glue, tmp_path_factory):
+    """The app module, configured through a .env that points it at app_glue."""
+    workdir = tmp_path_factory.mktemp('app')
+    (workdir / '.env').write_text('\n'.join([
+        'aws_access_key_id=test', 'aws_secret_access_key=test', 'aws_region=us-east-1',
+        f'glue_endpoint_url={app_glue.url}', 'glue_rate_limit=1000', 'glue_max_attempts=2',
+        'glue_warm_up=false']) + '\n')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(workdir)
+        module = importlib.import_module('main')
+    return module
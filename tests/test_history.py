@@ -0,0 +1,46 @@
+from cache import TTLCache
+from conftest import run
+from history import CrawlerHistory
+
+
+def names(glue):
+    return sorted(glue.crawlers)
+
+
+def test_fleet_walks_history_of_the_top_crawlers_only(glue, executor):
+    history = CrawlerHistory(executor, TTLCache())
+
+    stats = run(history.fleet(names(glue), top=3))
+
+    ranked = [crawler['CrawlerName'] for crawler in stats['Crawlers']]
+    runtimes = [crawler['Metrics']['MedianRuntimeSeconds'] for crawler in stats['Crawlers']]
+    assert len(ranked) == 3 and runtimes == sorted(runtimes, reverse=True)
+    assert runtimes[0] == max(record['MedianRuntimeSeconds'] for record in run(history.metrics(names(glue))).values())
+    assert glue.calls['ListCrawls'] == 3
+    assert glue.calls['GetCrawlerMetrics'] == 1
+    assert stats['CrawlerCount'] == stats['Summary']['Crawlers'] == len(glue.crawlers)
+    assert stats['TopSummary']['Runs'] == sum(crawler['Runs'] for crawler in stats['Crawlers'])
+
+
+def test_fleet_is_served_from_cache(glue, executor):
+    history = CrawlerHistory(executor, TTLCache())
+    run(history.fleet(names(glue), top=3))
+    calls = sum(glue.calls.values())
+
+    run(history.fleet(names(glue), top=3))
+
+    assert sum(glue.calls.values()) == calls
+
+
+def test_fleet_skips_crawlers_deleted_meanwhile(glue, executor):
+    history = CrawlerHistory(executor, TTLCache())
+    everyone = names(glue)
+    run(history.metrics(everyone))
+    top = run(history.fleet(everyone, top=2))['Crawlers'][0]['CrawlerName']
+    history.cache.pop(('list_crawls', None, top))
+    glue.DeleteCrawler({'Name': top})
+
+    stats = run(history.fleet(everyone, top=2))
+
+    assert top not in [crawler['CrawlerName'] for crawler in stats['Crawlers']]
+    assert len(stats['Crawlers']) == 1
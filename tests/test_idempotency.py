@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from conftest import run
+from fastapi.testclient import TestClient
+
+ROLE = 'arn:aws:iam::123456789012:role/glue-crawler'
+
+
+@pytest.fixture
+def client(main):
+    return TestClient(main.app)
+
+
+def crawler(name: str, path: str = 's3://bucket/raw/') -> dict:
+    return {'Name': name, 'Role': ROLE, 'DatabaseName': 'db', 'S3Path': path}
+
+
+def create(client, body: dict, key: str):
+    return client.post('/crawler/create_s3_crawler', json=body, headers={'Idempotency-Key': key})
+
+
+def test_repeated_request_is_replayed(client, app_glue):
+    key, name = uuid.uuid4().hex, f'idem-{uuid.uuid4().hex[:8]}'
+    calls = app_glue.calls['CreateCrawler']
+
+    first = create(client, crawler(name), key)
+    second = create(client, crawler(name), key)
+
+    assert first.json()['success'] is True
+    assert 'idempotent-replayed' not in first.headers
+    assert second.headers['idempotent-replayed'] == 'true'
+    assert second.json() == first.json()
+    assert app_glue.calls['CreateCrawler'] == calls + 1
+
+
+def test_key_reused_for_another_request_is_rejected(client):
+    key = uuid.uuid4().hex
+    create(client, crawler(f'idem-{uuid.uuid4().hex[:8]}'), key)
+
+    response = create(client, crawler(f'idem-{uuid.uuid4().hex[:8]}'), key)
+
+    assert response.status_code == 422
+    assert response.json()['message']['Code'] == 'IdempotencyKeyReused'
+
+
+def test_overlong_key_is_rejected(client, app_glue):
+    calls = app_glue.calls['CreateCrawler']
+    response = create(client, crawler('idem-long-key'), 'k' * 256)
+    assert response.status_code == 400
+    assert app_glue.calls['CreateCrawler'] == calls
+
+
+def test_definitive_glue_error_is_replayed(client, app_glue):
+    key = uuid.uuid4().hex
+    existing = crawler('bench-crawler-00000')
+    calls = app_glue.calls['CreateCrawler']
+
+    first = create(client, existing, key)
+    second = create(client, existing, key)
+
+    assert first.json()['message']['Code'] == 'AlreadyExistsException'
+    assert second.headers['idempotent-replayed'] == 'true'
+    assert app_glue.calls['CreateCrawler'] == calls + 1
+
+
+def test_retryable_failure_is_not_stored(client, app_glue):
+    key, name = uuid.uuid4().hex, f'idem-{uuid.uuid4().hex[:8]}'
+    app_glue.throttle_rate = 1
+    try:
+        failed = create(client, crawler(name), key)
+    finally:
+        app_glue.throttle_rate = 0
+    retried = create(client, crawler(name), key)
+
+    assert failed.json()['success'] is False
+    assert retried.json()['success'] is True
+    assert 'idempotent-replayed' not in retried.headers
+    assert name in app_glue.crawlers
+
+
+def test_concurrent_duplicates_share_one_execution(main, app_glue):
+    key, name = uuid.uuid4().hex, f'idem-{uuid.uuid4().hex[:8]}'
+    calls = app_glue.calls['CreateCrawler']
+
+    async def send_twice():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://test') as client:
+            return await asyncio.gather(*(client.post('/crawler/create_s3_crawler', json=crawler(name),
+                                                      headers={'Idempotency-Key': key}) for _ in range(2)))
+
+    app_glue.latency_ms = 100
+    try:
+        responses = run(send_twice())
+    finally:
+        app_glue.latency_ms = 0
+
+    assert [response.json()['success'] for response in responses] == [True, True]
+    assert app_glue.calls['CreateCrawler'] == calls + 1
+
+
+def test_requests_without_key_are_not_deduplicated(client, app_glue):
+    name = f'idem-{uuid.uuid4().hex[:8]}'
+    client.post('/crawler/create_s3_crawler', json=crawler(name))
+    response = client.post('/crawler/create_s3_crawler', json=crawler(name))
+    assert response.json()['message']['Code'] == 'AlreadyExistsException'
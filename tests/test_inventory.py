@@ -0,0 +1,26 @@
+import asyncio
+import uuid
+
+import httpx
+from conftest import run
+
+ROLE = 'arn:aws:iam::123456789012:role/glue-crawler'
+
+
+def test_crawlers_changed_through_the_service_reach_the_inventory(main):
+    name = f'inventory-{uuid.uuid4().hex[:8]}'
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url='http://test') as client:
+            await client.post('/crawler/create_s3_crawler', json={'Name': name, 'Role': ROLE, 'DatabaseName': 'db',
+                                                                  'S3Path': 's3://bucket/inventory/'})
+        deadline = asyncio.get_running_loop().time() + 5
+        while name not in main.inventory.crawlers:
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.01)
+        found = [crawler['Name'] for crawler in main.inventory.search(path_prefix='s3://bucket/inventory/')]
+        main.invalidate_crawler(name, deleted=True)
+        return found
+
+    assert run(scenario()) == [name]
+    assert name not in main.inventory.crawlers
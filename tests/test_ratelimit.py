@@ -0,0 +1,106 @@
+import random
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from conftest import glue_executor, run
+from ratelimit import RateLimiter, RetryPolicy, TokenBucket
+
+
+def test_token_bucket_paces_calls_beyond_the_burst():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def acquire(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    run(acquire(6))
+    assert time.monotonic() - start >= 0.09
+    assert bucket.requests == 6
+
+
+def test_token_bucket_halves_once_per_second_and_recovers_additively():
+    bucket = TokenBucket(rate=10, min_rate=1)
+    bucket.on_throttle()
+    bucket.on_throttle()
+    assert bucket.rate == 5
+    assert bucket.throttled == 2
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == pytest.approx(6)
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 10
+
+
+def test_token_bucket_rate_never_drops_below_min_rate():
+    bucket = TokenBucket(rate=2, min_rate=1.5)
+    bucket.on_throttle()
+    assert bucket.rate == 1.5
+
+
+def test_rate_limiter_uses_per_operation_rates():
+    limiter = RateLimiter(default_rate=10, rates={'start_crawler': 2})
+    assert limiter.bucket('start_crawler').max_rate == 2
+    assert limiter.bucket('get_crawler').max_rate == 10
+    assert limiter.bucket('get_crawler') is limiter.bucket('get_crawler')
+
+
+def test_retry_policy_retries_only_retryable_codes_within_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert not policy.should_retry('EntityNotFoundException', 0)
+    assert policy.should_retry('ThrottlingException', 0)
+    assert policy.should_retry('InternalServiceException', 1)
+    assert not policy.should_retry('ThrottlingException', 2)
+    assert policy.stats()['retries'] == 2
+    assert policy.stats()['exhausted'] == 1
+
+
+def test_retry_policy_budget_limits_retry_storms():
+    policy = RetryPolicy(max_attempts=10, budget=2, budget_ratio=0.5)
+    assert policy.should_retry('ThrottlingException', 0)
+    assert policy.should_retry('ThrottlingException', 0)
+    assert not policy.should_retry('ThrottlingException', 0)
+    policy.on_success()
+    policy.on_success()
+    assert policy.should_retry('ThrottlingException', 0)
+
+
+def test_retry_policy_backoff_is_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+    assert all(0 <= policy.backoff(attempt) <= 1.0 for attempt in range(20))
+
+
+def test_executor_retries_throttled_calls_against_glue(glue, executor):
+    random.seed(0)
+    glue.throttle_rate = 0.2
+
+    async def calls():
+        for i in range(20):
+            await executor.call('get_crawler', Name=f'bench-crawler-{i:05d}')
+
+    run(calls())
+    bucket = executor.limiter.bucket('get_crawler')
+    assert glue.faults['ThrottlingException'] > 0
+    assert bucket.throttled == glue.faults['ThrottlingException']
+    assert executor.retry.retries == glue.faults['ThrottlingException']
+
+
+def test_executor_gives_up_after_max_attempts(glue):
+    executor = glue_executor(glue.url, max_attempts=2)
+    glue.throttle_rate = 1
+    with pytest.raises(ClientError) as error:
+        run(executor.call('get_crawler', Name='bench-crawler-00000'))
+    executor.shutdown()
+    assert error.value.response['Error']['Code'] == 'ThrottlingException'
+    assert glue.calls['GetCrawler'] == 2
+    assert executor.retry.exhausted == 1
+
+
+def test_executor_does_not_retry_client_errors(glue, executor):
+    with pytest.raises(ClientError) as error:
+        run(executor.call('get_crawler', Name='missing'))
+    assert error.value.response['Error']['Code'] == 'EntityNotFoundException'
+    assert glue.calls['GetCrawler'] == 1
+    assert executor.retry.retries == 0
@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from batcher import CrawlerBatcher
+from conftest import run
+from runs import CrawlerRun, RunTracker
+
+
+def tracker(executor) -> RunTracker:
+    return RunTracker(CrawlerBatcher(executor).fetch, min_interval=0.05, max_interval=0.1)
+
+
+def test_wait_returns_when_the_run_finishes(glue, executor):
+    runs = tracker(executor)
+    glue.StartCrawler({'Name': 'bench-crawler-00000'})
+
+    async def scenario():
+        watched = runs.watch('bench-crawler-00000', started=True)
+        done = await runs.wait(watched, 10)
+        runs.stop()
+        return done, watched.snapshot()
+
+    done, snapshot = run(scenario())
+    assert done
+    assert snapshot['LastCrawl']['Status'] == 'SUCCEEDED'
+
+
+def test_started_run_that_ended_between_polls_finishes():
+    async def scenario():
+        earlier = CrawlerRun('crawler', started=True)
+        earlier.update({'State': 'READY', 'LastCrawl': {'Status': 'SUCCEEDED', 'StartTime': time.time() - 3600}})
+        ended = CrawlerRun('crawler', started=True)
+        ended.update({'State': 'READY', 'LastCrawl': {'Status': 'SUCCEEDED', 'StartTime': time.time()}})
+        return earlier.done.is_set(), ended.done.is_set()
+
+    assert run(scenario()) == (False, True)
+
+
+def test_close_releases_waits_and_subscribers(glue, executor):
+    glue.run_seconds = 3600
+    runs = tracker(executor)
+    glue.StartCrawler({'Name': 'bench-crawler-00000'})
+
+    async def scenario():
+        watched = runs.watch('bench-crawler-00000', started=True)
+        subscriber = asyncio.Queue()
+        watched.subscribers.append(subscriber)
+        asyncio.get_running_loop().call_later(0.2, runs.close)
+        start = time.monotonic()
+        done = await runs.wait(watched, 600)
+        elapsed = time.monotonic() - start
+        runs.stop()
+        return done, elapsed, subscriber.qsize()
+
+    done, elapsed, published = run(scenario())
+    assert not done
+    assert elapsed < 5
+    assert published >= 1
+
+    async def wait_after_close():
+        done = await runs.wait(runs.watch('bench-crawler-00001'), 600)
+        runs.stop()
+        return done
+
+    assert not run(wait_after_close())
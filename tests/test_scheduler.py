@@ -0,0 +1,87 @@
+import asyncio
+
+from batcher import CrawlerBatcher
+from conftest import run
+from runs import RunTracker
+from scheduler import StartQueue
+
+NAMES = [f'bench-crawler-{i:05d}' for i in range(6)]
+
+
+def start_queue(executor, max_running: int = 2) -> StartQueue:
+    tracker = RunTracker(CrawlerBatcher(executor).fetch, min_interval=0.05, max_interval=0.1)
+    return StartQueue(lambda name: executor.call('start_crawler', Name=name), tracker,
+                      max_running=max_running, retry_delay=0.05)
+
+
+async def drain(queue: StartQueue, executor, timeout: float = 10) -> int:
+    """Wait until the queue is empty and no start call or run is left; returns the peak of running crawlers."""
+    peak = 0
+    deadline = asyncio.get_running_loop().time() + timeout
+    while queue.stats()['queue_depth'] or queue.running or executor.in_flight:
+        assert asyncio.get_running_loop().time() < deadline, queue.stats()
+        peak = max(peak, len(queue.running))
+        await asyncio.sleep(0.01)
+    await queue.stop()
+    queue.tracker.stop()
+    return peak
+
+
+def test_start_queue_caps_running_crawlers(glue, executor):
+    queue = start_queue(executor, max_running=2)
+
+    async def scenario():
+        queued, skipped = await queue.enqueue(NAMES + NAMES[:1])
+        assert queued == NAMES and skipped == []
+        assert await queue.enqueue(NAMES[:2]) == ([], NAMES[:2])
+        return await drain(queue, executor)
+
+    assert run(scenario()) == 2
+    assert glue.calls['StartCrawler'] == len(NAMES)
+    assert all(glue.crawlers[name]['LastCrawl']['Status'] == 'SUCCEEDED' for name in NAMES)
+    assert queue.stats()['started'] == len(NAMES)
+    assert queue.failures == {}
+
+
+def test_start_queue_cancel_drops_waiting_crawlers(glue, executor):
+    queue = start_queue(executor, max_running=1)
+
+    async def scenario():
+        await queue.enqueue(NAMES[:3])
+        await asyncio.sleep(0.05)
+        cancelled = await queue.cancel(NAMES)
+        await drain(queue, executor)
+        return cancelled
+
+    assert run(scenario()) == NAMES[1:3]
+    assert glue.calls['StartCrawler'] == 1
+
+
+def test_start_queue_records_failures_and_tracks_running_crawlers(glue, executor):
+    queue = start_queue(executor)
+
+    async def scenario():
+        # Build the client first so the crawler is still running when the queue tries to start it.
+        await executor.call('get_crawler', Name=NAMES[0])
+        glue.StartCrawler({'Name': NAMES[0]})
+        await queue.enqueue([NAMES[0], 'missing'])
+        await drain(queue, executor)
+
+    run(scenario())
+    assert (None, NAMES[0]) in queue.tracker.runs
+    assert queue.failures[(None, 'missing')]['Code'] == 'EntityNotFoundException'
+    assert queue.stats()['started'] == 0
+    assert queue.stats()['failed'] == 1
+
+
+def test_start_queue_keeps_regions_apart(glue, executor):
+    queue = start_queue(executor)
+
+    async def scenario():
+        await queue.enqueue(NAMES[:1], region='eu-west-1')
+        assert queue.queued() == []
+        assert queue.queued('eu-west-1') == NAMES[:1]
+        await drain(queue, executor)
+
+    run(scenario())
+    assert ('eu-west-1', NAMES[0]) in queue.tracker.runs
@@ -0,0 +1,38 @@
+import pytest
+from cache import TTLCache
+from conftest import run
+from shared import TieredCache
+
+fakeredis = pytest.importorskip('fakeredis')
+
+LISTING = ('get_crawlers', None, 100, None)
+CRAWLER = ('get_crawler', None, 'bench-crawler-00000')
+
+
+def test_pop_prefix_deletes_indexed_listings_without_scanning():
+    async def scenario():
+        client = fakeredis.aioredis.FakeRedis()
+        cache = TieredCache(TTLCache(maxsize=16, ttl=30), client, indexed=('get_crawlers',))
+        cache.start()
+        cache.set(LISTING, {'Crawlers': []})
+        cache.set(('get_crawlers', 'eu-west-1', 100, None), {'Crawlers': []})
+        cache.set(CRAWLER, {'Name': 'bench-crawler-00000'})
+        await cache._writes.join()
+        before = sorted(key.decode() for key in await client.keys('*'))
+
+        def no_scan(*args, **kwargs):
+            raise AssertionError('invalidation scanned the keyspace')
+
+        client.scan_iter = no_scan
+        cache.pop_prefix(('get_crawlers', None))
+        await cache.stop()
+        after = sorted(key.decode() for key in await client.keys('*'))
+        return before, after, cache.shared_errors, cache.get(LISTING)
+
+    before, after, errors, local = run(scenario())
+    assert len(before) == 5
+    assert after == ['crawler-cache-index:["get_crawlers","eu-west-1"]',
+                     'crawler-cache:["get_crawler",null,"bench-crawler-00000"]',
+                     'crawler-cache:["get_crawlers","eu-west-1",100,null]']
+    assert errors == 0
+    assert local is None
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from batcher import CrawlerBatcher
+from conftest import run
+from runs import RunTracker
+from shared import SharedStartQueue
+
+fakeredis = pytest.importorskip('fakeredis')
+
+NAMES = [f'bench-crawler-{i:05d}' for i in range(6)]
+
+
+def worker(client, executor, max_running: int = 2) -> SharedStartQueue:
+    """One worker's queue; workers built on the same fake Redis server share their entries."""
+    tracker = RunTracker(CrawlerBatcher(executor).fetch, min_interval=0.05, max_interval=0.1)
+    return SharedStartQueue(client, lambda name: executor.call('start_crawler', Name=name), tracker,
+                            max_running=max_running, retry_delay=0.05, lease=0.3, poll_interval=0.02)
+
+
+async def drain(workers, executor, timeout: float = 10) -> int:
+    """Wait until the shared queue is empty and no start call or run is left; returns the peak of running crawlers."""
+    peak = 0
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        stats = (await workers[0].snapshot())['Stats']
+        if not (stats['queue_depth'] or stats['running'] or executor.in_flight):
+            break
+        assert asyncio.get_running_loop().time() < deadline, stats
+        peak = max(peak, stats['running'])
+        await asyncio.sleep(0.01)
+    for queue in workers:
+        await queue.stop()
+        queue.tracker.stop()
+    return peak
+
+
+async def leader(workers, timeout: float = 5) -> SharedStartQueue:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not any(queue.leading for queue in workers):
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+    return next(queue for queue in workers if queue.leading)
+
+
+def test_one_leader_caps_running_crawlers_across_workers(glue, executor):
+    async def scenario():
+        server = fakeredis.FakeServer()
+        workers = [worker(fakeredis.aioredis.FakeRedis(server=server), executor) for _ in range(3)]
+        for queue in workers:
+            queue.start()
+        await leader(workers)
+        queued, skipped = await workers[1].enqueue(NAMES + NAMES[:1])
+        assert queued == NAMES and skipped == []
+        assert await workers[2].enqueue(NAMES[:2]) == ([], NAMES[:2])
+        await asyncio.sleep(0.5)
+        assert sum(queue.leading for queue in workers) == 1
+        return await drain(workers, executor)
+
+    assert run(scenario()) == 2
+    assert glue.calls['StartCrawler'] == len(NAMES)
+    assert all(glue.crawlers[name]['LastCrawl']['Status'] == 'SUCCEEDED' for name in NAMES)
+
+
+def test_any_worker_cancels_and_lists_the_shared_queue(glue, executor):
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = (worker(fakeredis.aioredis.FakeRedis(server=server), executor, max_running=1)
+                         for _ in range(2))
+        first.start()
+        await leader([first])
+        await second.enqueue(NAMES[:3])
+        await second.enqueue(['missing'], region='eu-west-1')
+        await asyncio.sleep(0.1)
+        snapshot = await second.snapshot()
+        cancelled = await second.cancel(NAMES)
+        await drain([first, second], executor)
+        return snapshot, cancelled, await second.snapshot('eu-west-1')
+
+    snapshot, cancelled, regional = run(scenario())
+    assert snapshot['Running'] == NAMES[:1]
+    assert snapshot['Queued'] == NAMES[1:3]
+    assert snapshot['Stats']['queue_depth'] == 3
+    assert cancelled == NAMES[1:3]
+    assert glue.calls['StartCrawler'] == 2
+    assert regional['Failures']['missing']['Code'] == 'EntityNotFoundException'
+    assert regional['Stats']['started'] == 1
+
+
+def test_next_leader_adopts_running_crawlers(glue, executor):
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = (worker(fakeredis.aioredis.FakeRedis(server=server), executor, max_running=1)
+                         for _ in range(2))
+        await executor.call('get_crawler', Name=NAMES[0])
+        first.start()
+        await leader([first])
+        await first.enqueue(NAMES[:2])
+        while not (await first.snapshot())['Running']:
+            await asyncio.sleep(0.01)
+        await first.stop()
+        second.start()
+        await leader([second])
+        return await drain([second], executor)
+
+    assert run(scenario()) == 1
+    assert glue.calls['StartCrawler'] == 2
+    assert all(glue.crawlers[name]['LastCrawl']['Status'] == 'SUCCEEDED' for name in NAMES[:2])
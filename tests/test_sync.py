@@ -0,0 +1,59 @@
+from conftest import run
+from model import JdbcTargets, S3Targets
+from sync import changed_fields, matches, plan_sync, role_name
+
+ROLE = 'arn:aws:iam::123456789012:role/glue-crawler'
+
+
+def test_matches_ignores_extra_scalars_and_empty_collections():
+    assert matches({'S3Targets': [{'Path': 's3://a/'}]},
+                   {'S3Targets': [{'Path': 's3://a/', 'Exclusions': []}], 'JdbcTargets': [], 'Version': 3})
+
+
+def test_matches_rejects_extra_targets_and_list_changes():
+    assert not matches({'S3Targets': [{'Path': 's3://a/'}]},
+                       {'S3Targets': [{'Path': 's3://a/'}], 'JdbcTargets': [{'ConnectionName': 'c', 'Path': 'p'}]})
+    assert not matches({'S3Targets': [{'Path': 's3://a/'}]},
+                       {'S3Targets': [{'Path': 's3://a/'}, {'Path': 's3://b/'}]})
+    assert not matches({'S3Targets': [{'Path': 's3://a/'}]}, {'S3Targets': {'Path': 's3://a/'}})
+
+
+def test_roles_compare_by_name():
+    assert role_name(ROLE) == 'glue-crawler'
+    assert role_name('arn:aws:iam::123456789012:role/service-role/glue') == 'service-role/glue'
+    assert changed_fields({'Name': 'c', 'Role': ROLE}, {'Name': 'c', 'Role': 'glue-crawler'}) == []
+    assert changed_fields({'Name': 'c', 'Role': ROLE}, {'Name': 'c', 'Role': 'other'}) == ['Role']
+
+
+def current_crawlers(executor, names):
+    response = run(executor.call('batch_get_crawlers', CrawlerNames=names))
+    return {crawler['Name']: crawler for crawler in response['Crawlers']}
+
+
+def test_plan_sync_against_glue(glue, executor):
+    unchanged = S3Targets(Name='sync-unchanged', Role=ROLE, DatabaseName='db', S3Path='s3://bucket/a/')
+    updated = S3Targets(Name='sync-updated', Role=ROLE, DatabaseName='db', S3Path='s3://bucket/b/')
+    for glue_crawler in (unchanged, updated):
+        run(executor.call('create_crawler', **glue_crawler.crawler_params()))
+    run(executor.call('create_crawler', Name='sync-orphan', Role=ROLE, DatabaseName='db',
+                      Targets={'S3Targets': [{'Path': 's3://bucket/c/'}]}))
+
+    desired = [unchanged,
+               S3Targets(Name='sync-updated', Role=ROLE, DatabaseName='db', S3Path=['s3://bucket/b/', 's3://bucket/d/']),
+               JdbcTargets(Name='sync-new', Role=ROLE, DatabaseName='db', ConnectionName='pg', Path='db/%')]
+    current = current_crawlers(executor, ['sync-unchanged', 'sync-updated', 'sync-new', 'sync-orphan'])
+    plan = plan_sync(desired, current, managed=[name for name in glue.crawlers if name.startswith('sync-')])
+
+    assert plan == {'Create': ['sync-new'], 'Update': [{'Name': 'sync-updated', 'Fields': ['Targets']}],
+                    'Delete': ['sync-orphan'], 'Unchanged': ['sync-unchanged']}
+
+
+def test_plan_sync_is_empty_once_applied(glue, executor):
+    desired = [S3Targets(Name='sync-recrawl', Role=ROLE, DatabaseName='db', S3Path='s3://bucket/e/',
+                         RecrawlBehavior='CRAWL_NEW_FOLDERS_ONLY')]
+    run(executor.call('create_crawler', **desired[0].crawler_params()))
+
+    plan = plan_sync(desired, current_crawlers(executor, ['sync-recrawl']), managed=['sync-recrawl'])
+
+    assert glue.crawlers['sync-recrawl']['Role'] == 'glue-crawler'
+    assert plan == {'Create': [], 'Update': [], 'Delete': [], 'Unchanged': ['sync-recrawl']}